@@ -1,4 +1,4 @@
-''' Klotski solver using recursion
+''' Klotski solver using a layered search
     
     https://www.schoolarchimedes.com/klotski
 
@@ -18,14 +18,24 @@
     it finds a solution (or outputs the solution and continues searching for
     infinitely more solutions.
 
+    Importing this file doesn't run the search - running it does, and
+    klotski_cli.py runs the other searches without waiting for input.
+
     I have copied the output of running this program once into a block
-    comment at the bottom of this file.  The program takes a few minutes to 
-    run, and there is surely some further optimisation which can be done.
+    comment at the bottom of this file.  The program originally took a few
+    minutes to run.  It now searches one layer at a time in a loop, without
+    recursion, and finds the first solution in about a tenth of a second.
 
     In a bid to optimise the program, each time I generate a board, I find
-    a generic form of the board and add it to a list (eg without the numbers 
-    of specific pieces).  All boards are checked against that list to ensure
-    we aren't carrying forward any duplicate boards.  I am assuming that all
+    a generic form of the board and add it to a dictionary (eg without the
+    numbers of specific pieces), pointing back to the board it was reached
+    from.  All boards are checked against that dictionary to ensure
+    we aren't carrying forward any duplicate boards.  This was originally a
+    list, but checking a list means comparing against every board seen so
+    far, which made each layer slower than the last (see
+    klotski_benchmark.py).  The pointers back to the previous board are
+    followed to find the moves once a solution is found, rather than each
+    board carrying its own history.  I am assuming that all
     boards which we have already seen can be reached in a fewer number of move
     - the number of moves used to find that board in the first instance.  If
     we wanted to find all possible solutions this optimisation could be 
@@ -44,6 +54,9 @@
     B2 W2 W3 B4     B2 W2 W3 B4
     W1 XX XX W4     XX XX W1 W4
 
+    solveSlides() counts moves this way instead (a piece can slide any
+    distance, including around corners), and finds the 81 move solution.
+
     The solution is output in coordinates, however I could extend the code
     to show the board after each step.
 
@@ -85,9 +98,17 @@
 
 '''
 
-#import sys
-#sys.setrecursionlimit(3000)
-import copy
+import heapq
+import json
+import random
+import sys
+import time
+import tracemalloc
+
+try:
+    import resource
+except ImportError:
+    resource = None
 
 klotski_board = [
     ['B1', 'R1', 'R1', 'B3'],
@@ -117,6 +138,26 @@ vertical = ['B1','B2','B3','B4']
 horizontal = ['P1']
 big = ['R1'] 
 
+# Generic boards are encoded as a single integer holding a 20 bit mask for
+# each type of piece (see encode).  The cells covered by each type of piece,
+# relative to its top left cell:
+piece_types = ['W', 'B', 'P', 'R']
+piece_cells = {
+    'W': [[0, 0]],
+    'B': [[0, 0], [1, 0]],
+    'P': [[0, 0], [0, 1]],
+    'R': [[0, 0], [0, 1], [1, 0], [1, 1]]
+}
+
+# Mask of all 20 cells of the board, and the bit which is set in an encoded
+# board when R1 is in the solved position (top left cell at row 3, column 1)
+full_mask = (1 << 20) - 1
+solved_bit = 1 << (20*3 + 3*4 + 1)
+
+# Moves are stored as a single byte, made of the cell moved from and the
+# index of its direction in this list (up, down, left, right)
+directions = [[-1, 0], [1, 0], [0, -1], [0, 1]]
+
 
 def findValidMoves(board):
     ''' findValidMoves
@@ -329,13 +370,13 @@ def moveBoard(board, move):
                     board[i1][j1-1] = piece
             else:
                 # Moving Up
-                board[i0-1][j0] = 'XX'
+                board[i0+1][j0] = 'XX'
                 board[i1][j1] = piece
                 if piece == board[i0][j0+1]:
-                    board[i0-1][j0+1] = 'XX'
+                    board[i0+1][j0+1] = 'XX'
                     board[i1][j1+1] = piece
                 else:
-                    board[i0-1][j0-1] = 'XX'
+                    board[i0+1][j0-1] = 'XX'
                     board[i1][j1-1] = piece
     return board
 
@@ -369,14 +410,16 @@ def printMoves(move_list):
         i0, j0, i1, j1 = move[0], move[1], move[2], move[3]   
         print(f'({i0},{j0}) > ({i1},{j1})')
 
-def printBoards(move_list):
-    board = [
-        ['B1', 'R1', 'R1', 'B3'],
-        ['B1', 'R1', 'R1', 'B3'],
-        ['B2', 'P1', 'P1', 'B4'],
-        ['B2', 'W2', 'W3', 'B4'],
-        ['W1', 'XX', 'XX', 'W4']
-    ]
+def printBoards(move_list, board=None):
+    if board is None:
+        board = [
+            ['B1', 'R1', 'R1', 'B3'],
+            ['B1', 'R1', 'R1', 'B3'],
+            ['B2', 'P1', 'P1', 'B4'],
+            ['B2', 'W2', 'W3', 'B4'],
+            ['W1', 'XX', 'XX', 'W4']
+        ]
+    board = [row[:] for row in board]
     dispBoard(board)
     k = 1
     for move in move_list:
@@ -398,73 +441,1283 @@ def makeGeneral(board):
             replacementBoard[i][j] = board[i][j][0]
     return replacementBoard
 
-def solve(board_dictionary):
+def encode(board):
+    ''' encode
+    Packs the generic form of a board into a single integer.  The integer
+    holds a 20 bit mask for each piece type, in the order of piece_types, 
+    with bit i*4 + j set if the top left cell of a piece of that type is at
+    row i, column j.  Using the top left cell rather than every cell of a
+    piece means two pieces of the same type next to each other can't be
+    confused, so each generic board has exactly one encoding.
+    '''
+    state = 0
+    covered = [False] * 20
+    for i in range(5):
+        for j in range(4):
+            letter = board[i][j][0]
+            if letter == 'X' or covered[i*4 + j]:
+                continue
+            shift = 20 * piece_types.index(letter)
+            state |= 1 << (shift + i*4 + j)
+            for di, dj in piece_cells[letter]:
+                covered[(i + di)*4 + j + dj] = True
+    return state
+
+def decode(state):
+    ''' decode
+    Unpacks an encoded board back into a full board.  Pieces are numbered
+    in the order they are found reading the board row by row, so the
+    numbers may not match the board which was encoded.
+    '''
+    board = [['XX'] * 4 for i in range(5)]
+    counts = [0] * len(piece_types)
+    for k in range(20):
+        i, j = k // 4, k % 4
+        for t in range(len(piece_types)):
+            if (state >> (20*t + k)) & 1:
+                counts[t] += 1
+                letter = piece_types[t]
+                piece = letter + str(counts[t])
+                for di, dj in piece_cells[letter]:
+                    board[i + di][j + dj] = piece
+    return board
+
+def makeKey(board):
+    ''' makeKey
+    Finds a hashable key for the generic form of a board, so that the boards
+    we have already seen can be stored in a set rather than a list.  Checking
+    and adding to the set are both O(1), where searching the list meant
+    comparing against every board seen so far.
+    '''
+    return encode(board)
+
+# Masks of each column of the board, in all four piece masks, and of the
+# piece masks for the pieces one column wide (W and B) - the rest are two
+# columns wide
+column_masks = [sum(full_mask // 15 << (20*t + j) for t in range(4))
+                for j in range(4)]
+narrow_mask = sum(full_mask << 20*piece_types.index(letter)
+                  for letter in piece_types
+                  if max(cell[1] for cell in piece_cells[letter]) == 0)
+
+def mirrorState(state):
+    ''' mirrorState
+    Reflects an encoded board left to right.  A piece one column wide with
+    its top left cell in column j moves to column 3 - j, and a piece two
+    columns wide to column 2 - j.
+    '''
+    narrow = state & narrow_mask
+    wide = state & ~narrow_mask
+    c0, c1, c2, c3 = column_masks
+    return (((narrow & c0) << 3) | ((narrow & c1) << 1) |
+            ((narrow & c2) >> 1) | ((narrow & c3) >> 3) |
+            ((wide & c0) << 2) | (wide & c1) | ((wide & c2) >> 2))
+
+def mirrorKey(state):
+    ''' mirrorKey
+    The smaller of an encoded board and its reflection, so a board and its
+    reflection share a key.  The solved position and the moves are the
+    same either way round, so a board and its reflection are the same
+    number of moves from solved.
+    '''
+    mirrored = mirrorState(state)
+    if mirrored < state:
+        return mirrored
+    return state
+
+def encodeMove(move):
+    ''' encodeMove
+    Packs a move [i0, j0, i1, j1] into a number less than 80
+    '''
+    i0, j0, i1, j1 = move[0], move[1], move[2], move[3]
+    return (i0*4 + j0)*4 + directions.index([i1 - i0, j1 - j0])
+
+def decodeMove(code):
+    ''' decodeMove
+    Unpacks a move packed by encodeMove
+    '''
+    cell, direction = code // 4, code % 4
+    i0, j0 = cell // 4, cell % 4
+    di, dj = directions[direction]
+    return [i0, j0, i0 + di, j0 + dj]
+
+def findOccupied(state):
+    ''' findOccupied
+    Finds a 20 bit mask of the cells covered by pieces in an encoded board
+    '''
+    w = state & full_mask
+    b = (state >> 20) & full_mask
+    p = (state >> 40) & full_mask
+    r = state >> 60
+    return w | b | (b << 4) | p | (p << 1) | r | (r << 1) | (r << 4) | (r << 5)
+
+def makeMoveTable():
+    ''' makeMoveTable
+    Works out every move each type of piece could make from each cell, so
+    that finding the moves from a board doesn't mean checking the board cell
+    by cell.  Entry 20*t + k of the table lists the moves for a piece of
+    type piece_types[t] with its top left cell at cell k, as pairs of:
+        - a mask of the cells which must be empty to make the move (the
+          cells the piece moves into which it doesn't already cover)
+        - the bits to flip in the encoded board to make the move
+    '''
+    table = []
+    for t in range(len(piece_types)):
+        cells = piece_cells[piece_types[t]]
+        height = max(cell[0] for cell in cells) + 1
+        width = max(cell[1] for cell in cells) + 1
+        for k in range(20):
+            i, j = k // 4, k % 4
+            moves = []
+            if i + height <= 5 and j + width <= 4:
+                old = sum(1 << ((i + di)*4 + j + dj) for di, dj in cells)
+                for di, dj in directions:
+                    i1, j1 = i + di, j + dj
+                    if i1 < 0 or i1 + height > 5 or j1 < 0 or j1 + width > 4:
+                        continue
+                    new = old
+                    for ci, cj in cells:
+                        new |= 1 << ((i1 + ci)*4 + j1 + cj)
+                    flip = (1 << (20*t + k)) | (1 << (20*t + i1*4 + j1))
+                    moves.append((new & ~old, flip))
+            table.append(moves)
+    return table
+
+move_table = makeMoveTable()
+
+# The moves possible for each set of empty cells, worked out from the move
+# table the first time that set of empty cells is seen (see findEmptyMoves)
+empty_moves = {}
+
+def findEmptyMoves(empty):
+    ''' findEmptyMoves
+    Finds every move in the move table which only moves into the cells in
+    the mask empty, as pairs of:
+        - the bit which must be set in the encoded board for the piece to
+          be there
+        - the bits to flip in the encoded board to make the move
+    '''
+    moves = []
+    for index in range(len(move_table)):
+        for need, flip in move_table[index]:
+            if not need & ~empty:
+                moves.append((1 << index, flip))
+    empty_moves[empty] = moves
+    return moves
+
+def findNextStates(state):
+    ''' findNextStates
+    Finds every encoded board one move on from an encoded board.  There
+    are only ever a few empty cells, so the moves into those cells are
+    looked up and each is a single check that the piece is there.
+    '''
+    empty = full_mask & ~findOccupied(state)
+    moves = empty_moves.get(empty)
+    if moves is None:
+        moves = findEmptyMoves(empty)
+    return [state ^ flip for bit, flip in moves if state & bit]
+
+def findMoveFlips(state):
+    ''' findMoveFlips
+    Finds the bits to flip in an encoded board for every possible move, so
+    a move can be made and undone on the same board by XORing it with them
+    '''
+    empty = full_mask & ~findOccupied(state)
+    moves = empty_moves.get(empty)
+    if moves is None:
+        moves = findEmptyMoves(empty)
+    return [flip for bit, flip in moves if state & bit]
+
+# A random 64 bit number for each bit of an encoded board - that is, for
+# each type of piece with its top left cell at each cell (see zobristHash)
+zobrist_keys = [random.Random(index).getrandbits(64) for index in range(80)]
+
+def zobristHash(state):
+    ''' zobristHash
+    A 64 bit hash of an encoded board: the XOR of the zobrist_keys of its
+    set bits.  A move flips two bits, so the hash after a move is the hash
+    before XORed with the two keys (see zobrist_deltas), rather than
+    hashing the whole board again.
+    '''
+    key = 0
+    while state:
+        bit = state & -state
+        key ^= zobrist_keys[bit.bit_length() - 1]
+        state ^= bit
+    return key
+
+# The change to the hash made by each move in the move table, by the bits
+# the move flips
+zobrist_deltas = {flip: zobristHash(flip)
+                  for moves in move_table for need, flip in moves}
+
+def zobristBoard(board):
+    ''' zobristBoard
+    zobristHash() for a board
+    '''
+    return zobristHash(encode(board))
+
+def zobristMove(key, board, move):
+    ''' zobristMove
+    The hash of board after move, from its hash key before the move (board
+    itself is the board before the move, and isn't changed).  Only the
+    cells of the piece moved are looked at.
+    '''
+    i0, j0, i1, j1 = move
+    piece = board[i0][j0]
+    t = piece_types.index(piece[0])
+    for ci, cj in piece_cells[piece[0]]:
+        # The top left cell has no cell of the piece above or left of it
+        i, j = i0 - ci, j0 - cj
+        if (i >= 0 and j >= 0 and board[i][j] == piece and
+                (i == 0 or board[i - 1][j] != piece) and
+                (j == 0 or board[i][j - 1] != piece)):
+            break
+    k = i*4 + j
+    return (key ^ zobrist_keys[20*t + k] ^
+            zobrist_keys[20*t + k + (i1 - i0)*4 + j1 - j0])
+
+def makeShiftMoves():
+    ''' makeShiftMoves
+    Works out the masks needed to find every move in one direction for all
+    pieces at once.  The encoded board holds one mask per piece type, and
+    the empty cells are copied into each of the four masks, so shifting the
+    empty cells by the offset of a cell a piece needs lines them up with the
+    top left cells of the pieces which need it.  For each direction this 
+    gives:
+        - a mask of the top left cells from which each type of piece can
+          make the move without leaving the board
+        - a list of (offset, other) pairs, one for each cell which must be
+          empty, where other marks the piece types which don't need it
+        - the number of cells the top left cell moves by
+    '''
+    shift_moves = []
+    for di, dj in directions:
+        valid = 0
+        needs = {}
+        for t in range(len(piece_types)):
+            cells = piece_cells[piece_types[t]]
+            height = max(cell[0] for cell in cells) + 1
+            width = max(cell[1] for cell in cells) + 1
+            for k in range(20):
+                i1, j1 = k // 4 + di, k % 4 + dj
+                if (k // 4 + height <= 5 and k % 4 + width <= 4 and
+                        i1 >= 0 and i1 + height <= 5 and
+                        j1 >= 0 and j1 + width <= 4):
+                    valid |= 1 << (20*t + k)
+            for ci, cj in cells:
+                if [ci + di, cj + dj] not in cells:
+                    offset = (ci + di)*4 + cj + dj
+                    needs[offset] = needs.get(offset, 0) | (full_mask << 20*t)
+        terms = []
+        for offset in sorted(needs):
+            terms.append((offset, (full_mask * empty_copies) & ~needs[offset]))
+        shift_moves.append((valid, terms, di*4 + dj))
+    return shift_moves
+
+# Multiplying a 20 bit mask by empty_copies copies it into all four masks
+empty_copies = sum(1 << (20*t) for t in range(len(piece_types)))
+shift_moves = makeShiftMoves()
+
+def shiftNextStates(state):
+    ''' shiftNextStates
+    Finds every encoded board one move on from an encoded board, in the
+    same way as findNextStates but without a table of moves for each set of
+    empty cells.  Instead every piece which can move in a direction is found
+    at once by shifting the empty cells and ANDing them with the board.
+    '''
+    empty = (full_mask & ~findOccupied(state)) * empty_copies
+    next_states = []
+    for valid, terms, delta in shift_moves:
+        movable = state & valid
+        for offset, other in terms:
+            if offset > 0:
+                movable &= (empty >> offset) | other
+            else:
+                movable &= (empty << -offset) | other
+        while movable:
+            bit = movable & -movable
+            movable ^= bit
+            if delta > 0:
+                next_states.append(state ^ bit ^ (bit << delta))
+            else:
+                next_states.append(state ^ bit ^ (bit >> -delta))
+    return next_states
+
+def findMove(state, new_state):
+    ''' findMove
+    Finds the move [i0, j0, i1, j1] which takes the encoded board state to
+    new_state, one move on.  The cell moved from is the first cell of the
+    piece next to a cell it moves into.
+    '''
+    changed = state ^ new_state
+    old = (changed & state).bit_length() - 1
+    new = (changed & new_state).bit_length() - 1
+    cells = piece_cells[piece_types[old // 20]]
+    i, j = (old % 20) // 4, old % 4
+    di, dj = (new % 20) // 4 - i, new % 4 - j
+    for ci, cj in cells:
+        if [ci + di, cj + dj] not in cells:
+            return [i + ci, j + cj, i + ci + di, j + cj + dj]
+
+def findHistory(parents, state, mirror=False):
+    ''' findHistory
+    Follows the parent pointers back from an encoded board to the starting
+    board, and returns the list of moves taken to reach it.  If mirror is
+    True, parents is keyed by mirrorKey().
+    '''
+    states = [state]
+    while True:
+        if mirror:
+            parent = parents[mirrorKey(states[-1])]
+        else:
+            parent = parents[states[-1]]
+        if parent is None:
+            break
+        states.append(parent)
+    states.reverse()
+    moves = []
+    for index in range(1, len(states)):
+        moves.append(findMove(states[index - 1], states[index]))
+    return moves
+
+def expandLayer(board_dictionary):
+    ''' expandLayer
+    Expands the current layer of board_dictionary by one move, storing the
+    unseen boards as the next layer.  Returns a list of (board, moves)
+    pairs for any solutions found in the layer.
+
+    Rather than carrying the history of every board forward, 'allboards' 
+    maps each board seen to the board it was first reached from.  The moves
+    are only worked out, by following these back to the start, when a
+    solution is found.
+
+    If board_dictionary['mirror'] is True, boards are only carried forward
+    if neither they nor their reflection have been seen, and 'allboards' is
+    keyed by mirrorKey().  The boards themselves are not reflected, so the
+    pointers still lead back to the start through real moves.
+    '''
     # Extracting relevant variables from dictionary
     layer = board_dictionary['n']
     layer_key = 'n'+str(layer)
 
     boards = board_dictionary[layer_key]['boards']
-    history = board_dictionary[layer_key]['history']
-
-    print('Starting Layer {}, checked {} board layouts'.format(
-                                                        layer + 1,
-                                                        len(board_dictionary['allboards'])))
+    parents = board_dictionary['allboards']
+    mirror = board_dictionary['mirror']
 
     # Setting up variables for next layer
     new_boards = []
-    histories = []
+    solutions = []
     next_layer_key = 'n'+str(layer + 1)
 
-    # For each board, find all moves.
+    # For each board, find all moves.  Boards are stored encoded.
+    generated = 0
     for index_1 in range(len(boards)):
-        board = copy.deepcopy(boards[index_1])
-        ith_history = copy.deepcopy(history[index_1])
-        
-        # Check all potential moves
-        potential_moves = findValidMoves(boards[index_1])
-        # For each move
-        for index_2 in range(len(potential_moves)):
-            move = potential_moves[index_2]
-            ith_new_board = copy.deepcopy(board)
-
-            new_board = moveBoard(ith_new_board, move)
-            new_history = ith_history + [move]
+        state = boards[index_1]
+        next_states = findNextStates(state)
+        generated += len(next_states)
+
+        # For each board one move on
+        for key in next_states:
+            if mirror:
+                seen_key = mirrorKey(key)
+            else:
+                seen_key = key
 
             # Checking uniqueness of board
-            if makeGeneral(new_board) in board_dictionary['allboards']:
+            if seen_key in parents:
                 pass
-            # Check whether board provides a solution, if it does - output the 
-            # board
-            elif isSolved(new_board):
-                print('solved!\n')
-                dispBoard(new_board)
-                print()
-                printBoards(new_history)
-                input('more?')
+            # Check whether board provides a solution, if it does - store
+            # it to be output
+            elif key & solved_bit:
+                moves = findHistory(parents, state, mirror)
+                moves.append(findMove(state, key))
+                solutions.append((decode(key), moves))
             else:
-                new_boards.append(new_board)
-                histories.append(new_history)
-                board_dictionary['allboards'].append(makeGeneral(new_board))
+                new_boards.append(key)
+                parents[seen_key] = state
 
-    # Adding layer to dictionary and running next layer
+    # Adding layer to dictionary, and dropping the layer we have finished
+    # with - only the pointers in 'allboards' are needed to find the moves
     next_dictionary_layer = {
-        'boards': new_boards,
-        'history': histories
+        'boards': new_boards
     }
     board_dictionary[next_layer_key] = next_dictionary_layer
+    del board_dictionary[layer_key]
     board_dictionary['n'] += 1
-    solve(board_dictionary)
-
-klotski_dict = {
-    'n': 0,
-    'allboards': [],
-    'n0': {
-        'boards': [klotski_board],
-        'history': [[]]
+    board_dictionary['generated'] += generated
+    return solutions
+
+def findGoalStates(state):
+    ''' findGoalStates
+    Finds every encoded board with the same pieces as the encoded board
+    state, with R1 in the solved position.  Not all of them can be reached
+    from state.
+    '''
+    counts = [bin((state >> 20*t) & full_mask).count('1')
+              for t in range(len(piece_types))]
+    if counts[3] != 1:
+        return []
+    counts[3] = 0
+    empties = 20 - sum(len(piece_cells[piece_types[t]]) * 
+                       bin((state >> 20*t) & full_mask).count('1')
+                       for t in range(len(piece_types)))
+    goal = solved_bit
+    return placePieces(goal, findOccupied(goal), counts, empties)
+
+def placePieces(state, occupied, counts, empties):
+    ''' placePieces
+    Finds every way of filling the cells not in occupied with the pieces
+    left in counts (the number of each type of piece) and empties empty
+    cells, adding them to the encoded board state.
+    '''
+    if occupied == full_mask:
+        return [state]
+    # The first cell not yet filled
+    k = (~occupied & full_mask & -(~occupied & full_mask)).bit_length() - 1
+    states = []
+    if empties > 0:
+        states += placePieces(state, occupied | (1 << k), counts, empties - 1)
+    for t in range(len(piece_types)):
+        if counts[t] == 0:
+            continue
+        cells = piece_cells[piece_types[t]]
+        i, j = k // 4, k % 4
+        if any(i + ci > 4 or j + cj > 3 for ci, cj in cells):
+            continue
+        piece = sum(1 << ((i + ci)*4 + j + cj) for ci, cj in cells)
+        if piece & occupied:
+            continue
+        counts[t] -= 1
+        states += placePieces(state | (1 << (20*t + k)), occupied | piece,
+                              counts, empties)
+        counts[t] += 1
+    return states
+
+def findDepth(parents, state):
+    ''' findDepth
+    Counts the moves back from state to the start of its search
+    '''
+    depth = 0
+    while parents[state] is not None:
+        state = parents[state]
+        depth += 1
+    return depth
+
+def solveBidirectional(board, goals=None):
+    ''' solveBidirectional
+    Searches forwards from board, and backwards from the encoded boards in
+    goals (by default every solved board with the same pieces), until the
+    two searches meet.  Each time, the side
+    with the smaller layer is expanded by one move.  Every move can be
+    undone, so searching backwards uses the same moves as searching
+    forwards.  Returns the moves of an optimal solution (None if there is
+    no solution) and the number of boards expanded.
+    '''
+    start = encode(board)
+    if goals is None:
+        if start & solved_bit:
+            return [], 0
+        goals = findGoalStates(start)
+    if start in goals:
+        return [], 0
+    forward = {'parents': {start: None}, 'boards': [start]}
+    backward = {'parents': dict.fromkeys(goals), 'boards': list(goals)}
+    expanded = 0
+
+    while forward['boards'] and backward['boards']:
+        if len(forward['boards']) <= len(backward['boards']):
+            side, other = forward, backward
+        else:
+            side, other = backward, forward
+        parents = side['parents']
+        new_boards = []
+        meetings = []
+        for state in side['boards']:
+            for key in findNextStates(state):
+                if key in other['parents']:
+                    meetings.append((state, key))
+                elif key not in parents:
+                    parents[key] = state
+                    new_boards.append(key)
+        expanded += len(side['boards'])
+        side['boards'] = new_boards
+
+        if meetings:
+            # Every board in the layer is the same number of moves from
+            # its start, so the shortest solution meets the other search
+            # as close to its start as possible
+            state, key = min(meetings,
+                             key=lambda meeting: findDepth(other['parents'],
+                                                           meeting[1]))
+            if side is backward:
+                state, key = key, state
+            moves = findHistory(forward['parents'], state)
+            moves.append(findMove(state, key))
+            while backward['parents'][key] is not None:
+                moves.append(findMove(key, backward['parents'][key]))
+                key = backward['parents'][key]
+            return moves, expanded
+
+    return None, expanded
+
+def makeBlockingMasks():
+    ''' makeBlockingMasks
+    For each type of piece, finds a mask of the top left cells from which
+    a piece of that type covers part of the solved position of R1
+    '''
+    goal = findOccupied(solved_bit)
+    masks = []
+    for t in range(len(piece_types)):
+        mask = 0
+        for k in range(20):
+            for ci, cj in piece_cells[piece_types[t]]:
+                i, j = k // 4 + ci, k % 4 + cj
+                if i < 5 and j < 4 and goal & (1 << (i*4 + j)):
+                    mask |= 1 << k
+        masks.append(mask)
+    return masks
+
+blocking_masks = makeBlockingMasks()
+
+# Heuristics for solveAStar.  Each gives a lower bound on the number of
+# moves left to solve an encoded board, and changes by at most one with
+# each move, so A* always finds an optimal solution.
+
+def zeroHeuristic(state):
+    ''' zeroHeuristic
+    No estimate at all, which makes A* a breadth first search
+    '''
+    return 0
+
+def manhattanHeuristic(state):
+    ''' manhattanHeuristic
+    The number of moves R1 would take to reach the solved position on an
+    empty board
+    '''
+    r = (state >> 60).bit_length() - 1
+    if r < 0:
+        return 0
+    return abs(3 - r // 4) + abs(1 - r % 4)
+
+def blockingHeuristic(state):
+    ''' blockingHeuristic
+    manhattanHeuristic, plus one for each other piece covering part of the
+    solved position of R1, as each of those has to move at least once
+    '''
+    blocking = 0
+    for t in range(3):
+        blocking += bin((state >> 20*t) & blocking_masks[t]).count('1')
+    return manhattanHeuristic(state) + blocking
+
+heuristics = [zeroHeuristic, manhattanHeuristic, blockingHeuristic]
+
+def solveAStar(board, heuristic=blockingHeuristic):
+    ''' solveAStar
+    Finds an optimal solution from board with an A* search - boards are
+    expanded in order of the moves taken to reach them plus the heuristic's
+    estimate of the moves left, so boards which look further from solved
+    are put off.  Returns the moves of the solution (None if there is no
+    solution) and the number of boards expanded.
+    '''
+    start = encode(board)
+    parents = {start: None}
+    costs = {start: 0}
+    # Ties are broken towards the boards furthest from the start
+    queue = [(heuristic(start), 0, start)]
+    expanded = 0
+
+    while queue:
+        estimate, cost, state = heapq.heappop(queue)
+        cost = -cost
+        if cost > costs[state]:
+            # Already expanded with fewer moves
+            continue
+        if state & solved_bit:
+            return findHistory(parents, state), expanded
+        expanded += 1
+        for key in findNextStates(state):
+            if key not in costs or cost + 1 < costs[key]:
+                costs[key] = cost + 1
+                parents[key] = state
+                heapq.heappush(queue, 
+                               (cost + 1 + heuristic(key), -cost - 1, key))
+
+    return None, expanded
+
+def solveIDAStar(board, heuristic=blockingHeuristic, table_size=100000,
+                 hashed=False):
+    ''' solveIDAStar
+    Finds an optimal solution from board with an iterative deepening A*
+    search.  Each round is a depth first search which gives up on any board
+    whose moves taken plus heuristic estimate goes over a bound, and each 
+    round raises the bound to the lowest estimate which went over it.  
+
+    Only one board is kept, and moves are made and undone on it, so memory
+    grows with the length of the solution rather than the number of boards.
+    A transposition table of up to table_size boards remembers the fewest
+    moves each board was reached in this round, so boards reached again in
+    as many moves aren't searched twice - when it is full the oldest board
+    is dropped.  If hashed is True the table is keyed by the zobristHash()
+    of each board, updated with each move, rather than the encoded board.
+    Returns the moves of the solution (None if there is no solution) and
+    the number of boards expanded.
+    '''
+    start = encode(board)
+    if start & solved_bit:
+        return [], 0
+    bound = heuristic(start)
+    expanded = 0
+
+    while True:
+        state = start
+        key = zobristHash(start) if hashed else start
+        table = {key: 0}
+        on_path = {start}
+        path = []
+        flips = [findMoveFlips(start)]
+        next_bound = None
+
+        while flips:
+            if not flips[-1]:
+                # All moves tried from this board, so undo the move to it
+                flips.pop()
+                if path:
+                    on_path.discard(state)
+                    flip = path.pop()
+                    state ^= flip
+                    key = key ^ zobrist_deltas[flip] if hashed else state
+                continue
+
+            flip = flips[-1].pop()
+            new_state = state ^ flip
+            cost = len(path) + 1
+            if new_state in on_path:
+                continue
+            estimate = cost + heuristic(new_state)
+            if estimate > bound:
+                if next_bound is None or estimate < next_bound:
+                    next_bound = estimate
+                continue
+            new_key = key ^ zobrist_deltas[flip] if hashed else new_state
+            if table.get(new_key, cost + 1) <= cost:
+                continue
+
+            if new_state & solved_bit:
+                states = [start]
+                for move_flip in path + [flip]:
+                    states.append(states[-1] ^ move_flip)
+                moves = []
+                for index in range(1, len(states)):
+                    moves.append(findMove(states[index - 1], states[index]))
+                return moves, expanded
+
+            if table_size:
+                if len(table) >= table_size:
+                    del table[next(iter(table))]
+                table[new_key] = cost
+            state = new_state
+            key = new_key
+            path.append(flip)
+            on_path.add(state)
+            flips.append(findMoveFlips(state))
+            expanded += 1
+
+        if next_bound is None:
+            return None, expanded
+        bound = next_bound
+
+def searchFrontier(start, goal=None, relay=None):
+    ''' searchFrontier
+    Searches layer by layer from the encoded board start until it reaches
+    the encoded board goal (or any solved board if goal is None), keeping
+    only the previous, current and next layers.  Every move can be undone,
+    so a board one move on from the current layer can only be in one of
+    those three layers, and older layers are never needed to drop repeats.
+
+    Without older layers there are no pointers back to the start, so
+    instead each board carries the board in layer relay it was reached
+    through.  Returns the number of moves to the board found, the board
+    and its board in layer relay (None if relay isn't given), and the
+    number of boards expanded - or None, None, None and the number of
+    boards expanded if no board is found.
+    '''
+    previous = {}
+    current = {start: start if relay == 0 else None}
+    depth = 0
+    expanded = 0
+    while current:
+        for state in current:
+            if state == goal or (goal is None and state & solved_bit):
+                return depth, state, current[state], expanded
+        new = {}
+        for state, relay_state in current.items():
+            for key in findNextStates(state):
+                if key in previous or key in current or key in new:
+                    continue
+                if depth + 1 == relay:
+                    new[key] = key
+                else:
+                    new[key] = relay_state
+        expanded += len(current)
+        previous, current = current, new
+        depth += 1
+    return None, None, None, expanded
+
+def findFrontierPath(start, goal, depth):
+    ''' findFrontierPath
+    Finds the moves of a shortest path from the encoded board start to the
+    encoded board goal, depth moves away, with searchFrontier().  Finds
+    the board half way along the path, then the paths to and from it.
+    '''
+    if depth == 0:
+        return []
+    if depth == 1:
+        return [findMove(start, goal)]
+    middle = searchFrontier(start, goal, depth // 2)[2]
+    return (findFrontierPath(start, middle, depth // 2) +
+            findFrontierPath(middle, goal, depth - depth // 2))
+
+def solveFrontier(board):
+    ''' solveFrontier
+    Finds an optimal solution from board with searchFrontier(), so memory
+    only grows with the three widest layers rather than every board seen.
+    The search is run again to find each half of the path (and each half
+    of those) - a few times the work of a single search.  Returns the moves
+    of the solution (None if there is no solution) and the number of
+    boards expanded by the first search.
+    '''
+    depth, goal, middle, expanded = searchFrontier(encode(board))
+    if depth is None:
+        return None, expanded
+    return findFrontierPath(encode(board), goal, depth), expanded
+
+def slidePiece(state, bit):
+    ''' slidePiece
+    Flood fills the piece with its top left cell at bit (a bit of the 
+    encoded board state) through the empty cells.  Returns a dictionary of
+    every top left bit the piece can slide to, each mapped to the bit it
+    was first reached from (the starting bit maps to None).
+    '''
+    occupied = findOccupied(state ^ bit)
+    previous = {bit: None}
+    todo = [bit]
+    for current in todo:
+        for need, flip in move_table[current.bit_length() - 1]:
+            if not need & occupied:
+                new = flip ^ current
+                if new not in previous:
+                    previous[new] = current
+                    todo.append(new)
+    return previous
+
+def findSlideStates(state):
+    ''' findSlideStates
+    Finds every encoded board one slide on from an encoded board, where a
+    slide moves a single piece any number of cells through the empty cells
+    '''
+    moving = 0
+    for flip in findMoveFlips(state):
+        moving |= flip & state
+    next_states = []
+    while moving:
+        bit = moving & -moving
+        moving ^= bit
+        for new in slidePiece(state, bit):
+            if new != bit:
+                next_states.append(state ^ bit ^ new)
+    return next_states
+
+def findSlide(state, new_state):
+    ''' findSlide
+    Finds the single cell moves making up the slide from the encoded board
+    state to new_state
+    '''
+    changed = state ^ new_state
+    bit = changed & state
+    previous = slidePiece(state, bit)
+    current = changed & new_state
+    states = [new_state]
+    while previous[current] is not None:
+        states.append(state ^ bit ^ previous[current])
+        current = previous[current]
+    states.reverse()
+    moves = []
+    for index in range(1, len(states)):
+        moves.append(findMove(states[index - 1], states[index]))
+    return moves
+
+def solveSlides(board):
+    ''' solveSlides
+    Finds an optimal solution from board counting each slide of a piece,
+    however far and around however many corners, as one move (the metric
+    the 81 move solution uses).  Searches layer by layer like solve(), 
+    with findSlideStates() in place of findNextStates().  Returns a list of
+    the slides, each a list of the single cell moves making it up (None if
+    there is no solution), and the number of boards expanded.
+    '''
+    start = encode(board)
+    parents = {start: None}
+    boards = [start]
+    expanded = 0
+    if start & solved_bit:
+        return [], expanded
+
+    while boards:
+        new_boards = []
+        for state in boards:
+            expanded += 1
+            for key in findSlideStates(state):
+                if key in parents:
+                    continue
+                parents[key] = state
+                if key & solved_bit:
+                    states = [key]
+                    while parents[states[-1]] is not None:
+                        states.append(parents[states[-1]])
+                    states.reverse()
+                    slides = []
+                    for index in range(1, len(states)):
+                        slides.append(findSlide(states[index - 1],
+                                                states[index]))
+                    return slides, expanded
+                new_boards.append(key)
+        boards = new_boards
+
+    return None, expanded
+
+def makeDistanceTable(board=klotski_board):
+    ''' makeDistanceTable
+    Works backwards from every solved board with the same pieces as board,
+    one layer at a time, to find the fewest moves to solve every board
+    which can be solved at all.  Returns a dictionary mapping each of
+    those encoded boards to its number of moves from solved.
+    '''
+    boards = findGoalStates(encode(board))
+    distances = dict.fromkeys(boards, 0)
+    distance = 0
+    while boards:
+        distance += 1
+        new_boards = []
+        for state in boards:
+            for key in findNextStates(state):
+                if key not in distances:
+                    distances[key] = distance
+                    new_boards.append(key)
+        boards = new_boards
+    return distances
+
+def solveFromTable(distances, board):
+    ''' solveFromTable
+    Finds an optimal solution from board using a table made by
+    makeDistanceTable(), by always moving to a board one move closer to
+    solved.  Returns the moves, or None if board can't be solved.
+    '''
+    state = encode(board)
+    if state not in distances:
+        return None
+    moves = []
+    while distances[state] > 0:
+        for key in findNextStates(state):
+            if distances.get(key) == distances[state] - 1:
+                moves.append(findMove(state, key))
+                state = key
+                break
+    return moves
+
+def readBoards(path):
+    ''' readBoards
+    Reads boards from a text file with one board on each 5 lines, as the
+    generic board with a piece type letter (or X) for each cell separated
+    by spaces, and boards separated by blank lines (as boards.txt)
+    '''
+    boards = []
+    rows = []
+    with open(path) as f:
+        for line in f:
+            if line.split():
+                rows.append(line.split())
+            if len(rows) == 5:
+                boards.append(rows)
+                rows = []
+    return boards
+
+def isValidBoard(board):
+    ''' isValidBoard
+    Checks that a board is 5 rows of 4 cells, and made up of whole pieces
+    '''
+    if len(board) != 5 or any(len(row) != 4 for row in board):
+        return False
+    try:
+        return makeGeneral(decode(encode(board))) == makeGeneral(board)
+    except (IndexError, ValueError):
+        return False
+
+def solveBatch(boards, cache=None):
+    ''' solveBatch
+    Finds an optimal solution from each of a list of boards.  The table of
+    moves from solved made by makeDistanceTable() is the same for every
+    board with the same pieces, so it is made once for each set of pieces
+    and kept in cache, a dictionary by countPieces() which can be passed
+    to later calls to carry on using the same tables.  Returns the list of
+    moves for each board, or None for boards which can't be solved
+    (including boards which aren't made up of whole pieces).
+    '''
+    if cache is None:
+        cache = {}
+    solutions = []
+    for board in boards:
+        if not isValidBoard(board):
+            solutions.append(None)
+            continue
+        counts = countPieces(encode(board))
+        if counts not in cache:
+            cache[counts] = makeDistanceTable(board)
+        solutions.append(solveFromTable(cache[counts], board))
+    return solutions
+
+def countPieces(state):
+    ''' countPieces
+    The number of empty cells in an encoded board, followed by the number
+    of pieces of each type, as a tuple
+    '''
+    counts = [bin((state >> 20*t) & full_mask).count('1')
+              for t in range(len(piece_types))]
+    empties = 20 - sum(len(piece_cells[piece_types[t]]) * counts[t]
+                       for t in range(len(piece_types)))
+    return tuple([empties] + counts)
+
+def findOptions(occupied, counts):
+    ''' findOptions
+    Lists the ways the first cell not in occupied can be filled, given the
+    numbers of empty cells and pieces left in counts (as from
+    countPieces): left empty, or as the top left cell of a piece of each
+    type in turn.  Each is given as the bit to set in the encoded board (0
+    for an empty cell), the new occupied mask and the counts left.
+    '''
+    free = full_mask & ~occupied
+    bit = free & -free
+    k = bit.bit_length() - 1
+    i, j = k // 4, k % 4
+    options = []
+    if counts[0] > 0:
+        options.append((0, occupied | bit, (counts[0] - 1,) + counts[1:]))
+    for t in range(len(piece_types)):
+        if counts[t + 1] == 0:
+            continue
+        cells = piece_cells[piece_types[t]]
+        if any(i + ci > 4 or j + cj > 3 for ci, cj in cells):
+            continue
+        piece = sum(1 << ((i + ci)*4 + j + cj) for ci, cj in cells)
+        if piece & occupied:
+            continue
+        new_counts = counts[:t + 1] + (counts[t + 1] - 1,) + counts[t + 2:]
+        options.append((1 << (20*t + k), occupied | piece, new_counts))
+    return options
+
+# The ways to fill the first empty cell of each partly filled board, by the
+# cells filled and the counts left, with the number of boards coming before
+# each (see findLayoutOptions), and the number of boards in total
+layout_options = {}
+layout_counts = {}
+
+def findLayoutOptions(occupied, counts):
+    ''' findLayoutOptions
+    findOptions(), with the number of boards numbered by rankState() before
+    the boards made by each option added to the end of each
+    '''
+    key = (occupied, counts)
+    if key not in layout_options:
+        options = []
+        before = 0
+        for bit, new_occupied, new_counts in findOptions(occupied, counts):
+            options.append((bit, new_occupied, new_counts, before))
+            before += countLayouts(new_occupied, new_counts)
+        layout_options[key] = options
+    return layout_options[key]
+
+def countLayouts(occupied, counts):
+    ''' countLayouts
+    Counts the ways the cells not in occupied can be filled with exactly
+    the empty cells and pieces left in counts
+    '''
+    key = (occupied, counts)
+    if key in layout_counts:
+        return layout_counts[key]
+    if occupied == full_mask:
+        total = 1 if not any(counts) else 0
+    else:
+        total = 0
+        for bit, new_occupied, new_counts in findOptions(occupied, counts):
+            total += countLayouts(new_occupied, new_counts)
+    layout_counts[key] = total
+    return total
+
+def rankState(state):
+    ''' rankState
+    Numbers an encoded board among all the generic boards with the same
+    pieces, from 0 to countLayouts(0, countPieces(state)) - 1.  Boards are
+    numbered in the order placePieces() would fill them in: cell by cell,
+    with an empty cell first then each type of piece in turn, so the
+    number is the count of boards coming before this one in that order.
+    '''
+    counts = countPieces(state)
+    occupied = 0
+    empty = full_mask & ~findOccupied(state)
+    rank = 0
+    while occupied != full_mask:
+        for bit, new_occupied, new_counts, before in \
+                findLayoutOptions(occupied, counts):
+            if (bit & state) or (not bit and
+                                 (new_occupied & ~occupied) & empty):
+                break
+        rank += before
+        occupied, counts = new_occupied, new_counts
+    return rank
+
+def unrankState(rank, counts):
+    ''' unrankState
+    The encoded board numbered rank by rankState() among the boards with
+    the pieces in counts (as from countPieces)
+    '''
+    state = 0
+    occupied = 0
+    while occupied != full_mask:
+        options = findLayoutOptions(occupied, counts)
+        index = len(options) - 1
+        while options[index][3] > rank:
+            index -= 1
+        bit, occupied, counts, before = options[index]
+        state |= bit
+        rank -= before
+    return state
+
+def makeDistanceArray(board=klotski_board):
+    ''' makeDistanceArray
+    makeDistanceTable(), with the moves from solved stored in a bytearray
+    with one byte for each board numbered by rankState() - so it takes a
+    fixed, known amount of memory.  Boards which can't be solved are 255.
+    '''
+    counts = countPieces(encode(board))
+    distances = bytearray([255]) * countLayouts(0, counts)
+    boards = findGoalStates(encode(board))
+    for state in boards:
+        distances[rankState(state)] = 0
+    distance = 0
+    while boards:
+        distance += 1
+        new_boards = []
+        for state in boards:
+            for key in findNextStates(state):
+                rank = rankState(key)
+                if distances[rank] == 255:
+                    distances[rank] = distance
+                    new_boards.append(key)
+        boards = new_boards
+    return distances
+
+def findLayerSizes(board):
+    ''' findLayerSizes
+    Searches every board reachable from board layer by layer, marking the
+    boards seen in a bitmap with one bit for each board numbered by
+    rankState().  Returns the number of boards in each layer.
+    '''
+    start = encode(board)
+    seen = bytearray((countLayouts(0, countPieces(start)) + 7) // 8)
+    rank = rankState(start)
+    seen[rank >> 3] |= 1 << (rank & 7)
+    boards = [start]
+    sizes = []
+    while boards:
+        sizes.append(len(boards))
+        new_boards = []
+        for state in boards:
+            for key in findNextStates(state):
+                rank = rankState(key)
+                if not seen[rank >> 3] & (1 << (rank & 7)):
+                    seen[rank >> 3] |= 1 << (rank & 7)
+                    new_boards.append(key)
+        boards = new_boards
+    return sizes
+
+def makeDictionary(board, mirror=False):
+    ''' makeDictionary
+    Sets up the dictionary used by solve() to search from board.  If mirror
+    is True, a board and its reflection are treated as the same board.
+    The board is kept as 'board' so the moves found can be shown from it
+    (with its pieces numbered, if they aren't already).
+    '''
+    start = encode(board)
+    if mirror:
+        seen_key = mirrorKey(start)
+    else:
+        seen_key = start
+    if makeGeneral(board) == [list(row) for row in board]:
+        board = decode(start)
+    return {
+        'n': 0,
+        'board': [row[:] for row in board],
+        'mirror': mirror,
+        'generated': 0,
+        'allboards': {seen_key: None},
+        'n0': {
+            'boards': [start]
+        }
     }
-}
 
-solve(klotski_dict)
+def layerStats(board_dictionary):
+    ''' layerStats
+    Finds the statistics for the current layer of board_dictionary - the
+    layer number (counting from 1), the number of boards in the layer, the
+    number of board layouts checked so far, and the number of boards one
+    move on from the layers expanded so far (including repeats).
+    '''
+    layer = board_dictionary['n']
+    return {
+        'layer': layer + 1,
+        'boards': len(board_dictionary['n'+str(layer)]['boards']),
+        'checked': len(board_dictionary['allboards']),
+        'generated': board_dictionary['generated']
+    }
+
+def findSolutions(board_dictionary, limit=None, optimal=False):
+    ''' findSolutions
+    Expands board_dictionary one layer at a time as solve() does, but
+    without printing or waiting for input, yielding (moves, number of
+    moves) for each solution as its layer is expanded.  Stops after limit
+    solutions if limit is given, and after the layer of the first solution
+    (so only yields the optimal solutions) if optimal is True.  A limit of
+    0 or less yields nothing.
+    '''
+    if limit is not None and limit <= 0:
+        return
+    # expandLayer() only checks the boards it moves to, so check the start
+    if (board_dictionary['n'] == 0 and
+            board_dictionary['n0']['boards'][0] & solved_bit):
+        yield [], 0
+        return
+    found = 0
+    while layerStats(board_dictionary)['boards'] > 0:
+        for new_board, moves in expandLayer(board_dictionary):
+            yield moves, len(moves)
+            found += 1
+            if found == limit:
+                return
+        if optimal and found:
+            return
+
+def forwardSolve(board, mirror=False):
+    ''' forwardSolve
+    Runs the layered search in expandLayer() until the first solutions,
+    returning the moves of the first (None if there is no solution) and
+    the number of boards expanded.
+    '''
+    board_dictionary = makeDictionary(board, mirror)
+    if board_dictionary['n0']['boards'][0] & solved_bit:
+        return [], 0
+    expanded = 0
+    while True:
+        stats = layerStats(board_dictionary)
+        if stats['boards'] == 0:
+            return None, expanded
+        expanded += stats['boards']
+        solutions = expandLayer(board_dictionary)
+        if solutions:
+            return solutions[0][1], expanded
+
+def findPeakRSS():
+    ''' findPeakRSS
+    The most memory this process has used so far in bytes, or None where
+    the resource module isn't available (eg Windows)
+    '''
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == 'darwin':
+        return peak
+    return peak * 1024
+
+def measureLayers(board_dictionary, callback=None, output=None):
+    ''' measureLayers
+    Expands board_dictionary one layer at a time until there are no new
+    boards left, measuring each layer as it goes:
+        - layer: the layer number (counting from 1)
+        - frontier: the number of boards in the layer
+        - new: the number of new boards found for the next layer
+        - duplicates: the number of boards found which had been seen
+        - solutions: the number of solutions found
+        - branching: the average number of moves from each board
+        - seconds: the time taken to expand the layer
+        - checked: the number of board layouts checked so far
+        - peak_rss: the most memory the process has used so far, in bytes
+        - peak_traced: the most memory traced by tracemalloc while
+          expanding the layer, in bytes (None unless tracemalloc is on)
+    Each layer's measurements are passed to callback as a dictionary, or
+    if callback isn't given written to output (by default stdout) as a
+    line of JSON.  Returns the list of measurements.
+    '''
+    if output is None:
+        output = sys.stdout
+    records = []
+    stats = layerStats(board_dictionary)
+    while stats['boards'] > 0:
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+        start_time = time.perf_counter()
+        solutions = expandLayer(board_dictionary)
+        layer_time = time.perf_counter() - start_time
+        peak_traced = None
+        if tracemalloc.is_tracing():
+            peak_traced = tracemalloc.get_traced_memory()[1]
+
+        new_stats = layerStats(board_dictionary)
+        generated = new_stats['generated'] - stats['generated']
+        record = {
+            'layer': stats['layer'],
+            'frontier': stats['boards'],
+            'new': new_stats['boards'],
+            'duplicates': generated - new_stats['boards'] - len(solutions),
+            'solutions': len(solutions),
+            'branching': generated / stats['boards'],
+            'seconds': layer_time,
+            'checked': new_stats['checked'],
+            'peak_rss': findPeakRSS(),
+            'peak_traced': peak_traced
+        }
+        records.append(record)
+        if callback is None:
+            output.write(json.dumps(record) + '\n')
+        else:
+            callback(record)
+        stats = new_stats
+    return records
+
+def solve(board_dictionary):
+    ''' solve
+    Expands board_dictionary one layer at a time until there are no new
+    boards left, outputting every solution found on the way.  Only the
+    current and next layers are kept in board_dictionary.
+    '''
+    stats = layerStats(board_dictionary)
+    while stats['boards'] > 0:
+        print('Starting Layer {}, checked {} board layouts'.format(
+                                                stats['layer'],
+                                                stats['checked']))
+
+        # Output any solutions found, then run the next layer
+        for new_board, moves in expandLayer(board_dictionary):
+            print('solved!\n')
+            dispBoard(new_board)
+            print()
+            printBoards(moves, board_dictionary['board'])
+            input('more?')
+
+        stats = layerStats(board_dictionary)
+
+    print('Checked all {} board layouts'.format(stats['checked']))
+
+if __name__ == '__main__':
+    solve(makeDictionary(klotski_board))
 
 
 '''
@@ -0,0 +1,689 @@
+''' Klotski benchmarks
+
+    Timings for the different parts of the solver in klotski.py, run from
+    the standard klotski_board starting grid.
+
+    Usage:
+        python klotski_benchmark.py [layers]
+
+    #### Visited index ####
+    Compares the time taken to expand each layer when the boards we have
+    already seen are kept in a list of generic boards (as solve() originally
+    did) against the set of keys now used.  Searching the list gets slower
+    with every board added, so the list timings grow with each layer while
+    the set timings only grow with the size of the layer itself.
+
+    #### Board encoding ####
+    Compares the memory used to store one board and its history as a list
+    of lists of piece names, against an encoded integer and a bytes object
+    of encoded moves (as solve() stored them before it kept parent pointers
+    instead of histories, see below).
+
+    #### Parent pointers ####
+    Compares the peak memory traced while expanding each layer when every
+    board carries its history forward, against storing a pointer to the
+    board each board was first reached from.  Runs all 116 layers to the
+    first solution.
+
+    #### Move tables ####
+    Compares the time taken to find the boards one move on from every
+    reachable board, using findValidMoves() and moveBoard() on full boards
+    against the move table lookups in findNextStates() and the shifted
+    masks in shiftNextStates().  (test_klotski.py checks that all three
+    find exactly the same boards from every reachable board.)
+
+    #### Bidirectional search ####
+    Compares the boards expanded and time taken to find an optimal solution
+    searching forwards only, against searching forwards and backwards from
+    all the solved boards at once, and from just the solved board the
+    forwards search reached.
+
+    #### A* search ####
+    The boards expanded and time taken by solveAStar() with each of the
+    heuristics in klotski.heuristics, from the standard board and from a
+    board part way through its solution.
+
+    #### IDA* search ####
+    The boards expanded, time taken and peak memory traced by solveAStar()
+    and solveIDAStar() with different transposition table sizes, and with
+    the table keyed by Zobrist hash, from a board 36 moves from solved.
+    (From the standard board, IDA* with the default table expands about 16
+    million boards and takes minutes.)
+
+    #### Mirror symmetry ####
+    The boards expanded and seen, and time taken, to the first solution
+    with and without treating boards and their reflections as the same.
+
+    #### Frontier search ####
+    The boards expanded, time taken and peak memory traced to the first
+    solution keeping every board seen (solve()), against keeping only the
+    last three layers (klotski.solveFrontier()).
+
+    #### Move metrics ####
+    The length of the optimal solution, boards expanded and time taken
+    counting each single cell move as a move (solve()) and counting each
+    slide of a piece as a move (solveSlides()).
+
+    #### Distance table ####
+    The time taken to build the table of moves from solved for every
+    solvable board, and to solve the standard board by searching, against
+    following the table.
+
+    #### Dense ranking ####
+    The memory and time taken to store the moves from solved of every
+    solvable board, and to find every reachable board, keyed by encoded
+    board in a dictionary and set, against indexed by klotski.rankState()
+    in a bytearray and bitmap.  Before timing, checks that rankState() and
+    unrankState() number every reachable board uniquely and back again.
+
+    #### Batch solving ####
+    The time taken to solve every board in boards.txt with
+    klotski.solveBatch(), sharing one distance table between them, against
+    searching from each of the first few boards separately.
+
+    #### Solution database ####
+    The time taken to open the database file written by klotski_db.py and
+    look up a board, against searching again or rebuilding the table.
+
+    #### Parallel search ####
+    The time taken to find every reachable board with
+    klotski_parallel.solveParallel() and 1, 2, 4 and 8 workers, against a
+    plain search in one process.  Then the same with the boards seen kept
+    in a shared bitmap by klotski_parallel.findLayersShared(), against
+    klotski.findLayerSizes() in one process.
+
+    #### External memory search ####
+    The time taken and peak memory traced to find every reachable board
+    with each layer in memory (solve()), against with the layers in files
+    on disk by klotski_external.solveExternal(), reading different numbers
+    of boards at a time.  Checks both find the same number of boards in
+    each layer.
+
+    #### NumPy layers ####
+    The time taken to find every reachable board with whole layers moved
+    at once by klotski_numpy.findLayers(), against one board at a time.
+    Skipped if NumPy isn't installed.
+
+@author = R Soane
+'''
+
+import copy
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import klotski
+import klotski_db
+import klotski_external
+import klotski_parallel
+
+
+def listLayer(boards, histories, allboards):
+    ''' listLayer
+    One layer of the original search, checking each new board against a
+    list of every generic board seen so far.
+    '''
+    new_boards = []
+    new_histories = []
+    for index_1 in range(len(boards)):
+        board = copy.deepcopy(boards[index_1])
+        ith_history = copy.deepcopy(histories[index_1])
+        for move in klotski.findValidMoves(boards[index_1]):
+            new_board = klotski.moveBoard(copy.deepcopy(board), move)
+            if klotski.makeGeneral(new_board) in allboards:
+                pass
+            elif klotski.isSolved(new_board):
+                pass
+            else:
+                new_boards.append(new_board)
+                new_histories.append(ith_history + [move])
+                allboards.append(klotski.makeGeneral(new_board))
+    return new_boards, new_histories
+
+def timeListLayers(layers):
+    boards, histories, allboards = [klotski.klotski_board], [[]], []
+    times = []
+    for _ in range(layers):
+        start_time = time.perf_counter()
+        boards, histories = listLayer(boards, histories, allboards)
+        times.append(time.perf_counter() - start_time)
+    return times
+
+def historyLayer(boards, histories, visited):
+    ''' historyLayer
+    One layer of the search with encoded boards, carrying a bytes history
+    of encoded moves forward with every board.
+    '''
+    new_boards = []
+    new_histories = []
+    for index_1 in range(len(boards)):
+        board = klotski.decode(boards[index_1])
+        for move in klotski.findValidMoves(board):
+            new_board = klotski.moveBoard([row[:] for row in board], move)
+            key = klotski.makeKey(new_board)
+            if key in visited:
+                pass
+            elif klotski.isSolved(new_board):
+                pass
+            else:
+                new_boards.append(key)
+                new_histories.append(
+                    histories[index_1] + bytes([klotski.encodeMove(move)]))
+                visited.add(key)
+    return new_boards, new_histories
+
+def timeSetLayers(layers):
+    board_dictionary = klotski.makeDictionary(klotski.klotski_board)
+    times = []
+    sizes = []
+    for _ in range(layers):
+        sizes.append(len(board_dictionary['allboards']))
+        start_time = time.perf_counter()
+        klotski.expandLayer(board_dictionary)
+        times.append(time.perf_counter() - start_time)
+    return times, sizes
+
+def benchVisited(layers):
+    print('#### Visited index: seconds per layer ####')
+    list_times = timeListLayers(layers)
+    set_times, sizes = timeSetLayers(layers)
+    print('{:>6} {:>8} {:>10} {:>10}'.format('layer', 'seen', 'list', 'set'))
+    for layer in range(layers):
+        print('{:>6} {:>8} {:>10.4f} {:>10.4f}'.format(
+            layer + 1, sizes[layer], list_times[layer], set_times[layer]))
+    print('{:>6} {:>8} {:>10.4f} {:>10.4f}'.format(
+        'total', '', sum(list_times), sum(set_times)))
+
+def sizeOf(obj):
+    ''' sizeOf
+    Size in bytes of an object and any lists it holds.  Piece names and
+    small numbers are shared between all boards, so aren't counted.
+    '''
+    size = sys.getsizeof(obj)
+    if isinstance(obj, list):
+        for item in obj:
+            if isinstance(item, list):
+                size += sizeOf(item)
+    return size
+
+def benchEncoding(layers):
+    print('#### Board encoding: bytes per stored board ####')
+    boards = [klotski.encode(klotski.klotski_board)]
+    histories = [b'']
+    visited = set(boards)
+    for _ in range(layers):
+        boards, histories = historyLayer(boards, histories, visited)
+    state, history = boards[0], histories[0]
+    board = klotski.decode(state)
+    moves = [klotski.decodeMove(code) for code in history]
+    print('after {} moves'.format(layers))
+    print('{:>10} {:>8} {:>8}'.format('', 'board', 'history'))
+    print('{:>10} {:>8} {:>8}'.format('lists', sizeOf(board), sizeOf(moves)))
+    print('{:>10} {:>8} {:>8}'.format(
+        'encoded', sys.getsizeof(state), sys.getsizeof(history)))
+    print('generic key: {} bytes as a list, {} bytes encoded'.format(
+        sizeOf(klotski.makeGeneral(board)), sys.getsizeof(state)))
+    start_time = time.perf_counter()
+    for _ in range(10000):
+        hash(klotski.makeKey(board))
+    key_time = time.perf_counter() - start_time
+    start_time = time.perf_counter()
+    for _ in range(10000):
+        hash(state)
+    hash_time = time.perf_counter() - start_time
+    print('10000 hashes: {:.4f}s encoding each board, {:.4f}s stored'.format(
+        key_time, hash_time))
+
+def benchParents(layers):
+    print('#### Parent pointers: peak traced bytes per layer ####')
+    boards = [klotski.encode(klotski.klotski_board)]
+    histories = [b'']
+    visited = set(boards)
+    history_peaks = []
+    tracemalloc.start()
+    for _ in range(layers):
+        tracemalloc.reset_peak()
+        boards, histories = historyLayer(boards, histories, visited)
+        history_peaks.append(tracemalloc.get_traced_memory()[1])
+    del boards, histories, visited
+
+    board_dictionary = klotski.makeDictionary(klotski.klotski_board)
+    parent_peaks = []
+    tracemalloc.reset_peak()
+    for _ in range(layers):
+        tracemalloc.reset_peak()
+        klotski.expandLayer(board_dictionary)
+        parent_peaks.append(tracemalloc.get_traced_memory()[1])
+    tracemalloc.stop()
+
+    print('{:>6} {:>12} {:>12}'.format('layer', 'histories', 'parents'))
+    for layer in range(layers):
+        if (layer + 1) % 10 == 0 or layer + 1 == layers:
+            print('{:>6} {:>12} {:>12}'.format(
+                layer + 1, history_peaks[layer], parent_peaks[layer]))
+    print('{:>6} {:>12} {:>12}'.format(
+        'max', max(history_peaks), max(parent_peaks)))
+
+
+def reachableStates(start):
+    ''' reachableStates
+    Every encoded board which can be reached from start, in the order found
+    '''
+    states = [start]
+    seen = {start}
+    for state in states:
+        for new_state in klotski.findNextStates(state):
+            if new_state not in seen:
+                seen.add(new_state)
+                states.append(new_state)
+    return states
+
+def benchSuccessors():
+    print('#### Move tables: finding the boards one move on ####')
+    states = reachableStates(klotski.encode(klotski.klotski_board))
+    boards = [klotski.decode(state) for state in states]
+    print('{} reachable boards'.format(len(states)))
+
+    start_time = time.perf_counter()
+    for board in boards:
+        for move in klotski.findValidMoves(board):
+            klotski.encode(klotski.moveBoard([row[:] for row in board], move))
+    legacy_time = time.perf_counter() - start_time
+    print('findValidMoves/moveBoard: {:.4f}s'.format(legacy_time))
+
+    for find in [klotski.findNextStates, klotski.shiftNextStates]:
+        start_time = time.perf_counter()
+        for state in states:
+            find(state)
+        find_time = time.perf_counter() - start_time
+        print('{:<25} {:.4f}s ({:.1f}x)'.format(
+            find.__name__ + ':', find_time, legacy_time / find_time))
+
+
+def benchBidirectional():
+    print('#### Bidirectional search ####')
+    print('{:<30} {:>6} {:>9} {:>9}'.format(
+        '', 'moves', 'expanded', 'seconds'))
+    board = klotski.klotski_board
+    start_time = time.perf_counter()
+    moves, expanded = klotski.forwardSolve(board)
+    solve_time = time.perf_counter() - start_time
+    print('{:<30} {:>6} {:>9} {:>9.4f}'.format(
+        'forwards', len(moves), expanded, solve_time))
+
+    # The solved board forwardSolve reached, as a single goal
+    solved_board = [row[:] for row in board]
+    for move in moves:
+        solved_board = klotski.moveBoard(solved_board, move)
+    for name, goals in [['bidirectional, all solved', None],
+                        ['bidirectional, one solved',
+                         [klotski.encode(solved_board)]]]:
+        start_time = time.perf_counter()
+        moves, expanded = klotski.solveBidirectional(board, goals)
+        solve_time = time.perf_counter() - start_time
+        print('{:<30} {:>6} {:>9} {:>9.4f}'.format(
+            name, len(moves), expanded, solve_time))
+
+
+def benchAStar():
+    print('#### A* search: boards expanded per heuristic ####')
+    # The standard board, and the board 80 moves into the first solution
+    moves, expanded = klotski.forwardSolve(klotski.klotski_board)
+    later_board = [row[:] for row in klotski.klotski_board]
+    for move in moves[:80]:
+        later_board = klotski.moveBoard(later_board, move)
+
+    for name, board in [['klotski_board', klotski.klotski_board],
+                        ['after 80 moves', later_board]]:
+        print('{:<20} {:>6} {:>9} {:>9}'.format(
+            name, 'moves', 'expanded', 'seconds'))
+        for heuristic in klotski.heuristics:
+            start_time = time.perf_counter()
+            moves, expanded = klotski.solveAStar(board, heuristic)
+            solve_time = time.perf_counter() - start_time
+            print('{:<20} {:>6} {:>9} {:>9.4f}'.format(
+                heuristic.__name__, len(moves), expanded, solve_time))
+
+
+def benchIDAStar():
+    print('#### IDA* search: boards 36 moves from solved ####')
+    moves, expanded = klotski.forwardSolve(klotski.klotski_board)
+    board = [row[:] for row in klotski.klotski_board]
+    for move in moves[:80]:
+        board = klotski.moveBoard(board, move)
+
+    print('{:<20} {:>6} {:>9} {:>9} {:>10}'.format(
+        '', 'moves', 'expanded', 'seconds', 'peak'))
+    solvers = [['A*', klotski.solveAStar, {}]]
+    for table_size in [100000, 10000, 1000]:
+        solvers.append(['IDA*, table {}'.format(table_size), 
+                        klotski.solveIDAStar, {'table_size': table_size}])
+    solvers.append(['IDA*, hashed', klotski.solveIDAStar, {'hashed': True}])
+    for name, solve, options in solvers:
+        tracemalloc.start()
+        start_time = time.perf_counter()
+        moves, expanded = solve(board, **options)
+        solve_time = time.perf_counter() - start_time
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print('{:<20} {:>6} {:>9} {:>9.4f} {:>10}'.format(
+            name, len(moves), expanded, solve_time, peak))
+
+
+def benchMirror():
+    print('#### Mirror symmetry ####')
+    print('{:<10} {:>6} {:>9} {:>9} {:>9}'.format(
+        '', 'moves', 'expanded', 'seen', 'seconds'))
+    for mirror in [False, True]:
+        board_dictionary = klotski.makeDictionary(klotski.klotski_board,
+                                                  mirror)
+        expanded = 0
+        start_time = time.perf_counter()
+        while True:
+            expanded += klotski.layerStats(board_dictionary)['boards']
+            solutions = klotski.expandLayer(board_dictionary)
+            if solutions:
+                break
+        solve_time = time.perf_counter() - start_time
+
+        # Check the moves are real moves from the starting board
+        board = [row[:] for row in klotski.klotski_board]
+        for move in solutions[0][1]:
+            board = klotski.moveBoard(board, move)
+        assert klotski.isSolved(board)
+        print('{:<10} {:>6} {:>9} {:>9} {:>9.4f}'.format(
+            'mirror' if mirror else 'plain', len(solutions[0][1]), expanded,
+            len(board_dictionary['allboards']), solve_time))
+
+
+def benchFrontier():
+    print('#### Frontier search ####')
+    print('{:<15} {:>6} {:>9} {:>9} {:>10}'.format(
+        '', 'moves', 'expanded', 'seconds', 'peak'))
+    for name, solve in [['solve()', klotski.forwardSolve],
+                        ['solveFrontier()', klotski.solveFrontier]]:
+        tracemalloc.start()
+        start_time = time.perf_counter()
+        moves, expanded = solve(klotski.klotski_board)
+        solve_time = time.perf_counter() - start_time
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print('{:<15} {:>6} {:>9} {:>9.4f} {:>10}'.format(
+            name, len(moves), expanded, solve_time, peak))
+
+
+def benchSlides():
+    print('#### Move metrics: single cell moves against slides ####')
+    print('{:<15} {:>6} {:>9} {:>9}'.format(
+        '', 'moves', 'expanded', 'seconds'))
+    start_time = time.perf_counter()
+    moves, expanded = klotski.forwardSolve(klotski.klotski_board)
+    solve_time = time.perf_counter() - start_time
+    print('{:<15} {:>6} {:>9} {:>9.4f}'.format(
+        'single cell', len(moves), expanded, solve_time))
+    start_time = time.perf_counter()
+    slides, expanded = klotski.solveSlides(klotski.klotski_board)
+    solve_time = time.perf_counter() - start_time
+    print('{:<15} {:>6} {:>9} {:>9.4f}'.format(
+        'slides', len(slides), expanded, solve_time))
+
+
+def benchDistanceTable():
+    print('#### Distance table ####')
+    start_time = time.perf_counter()
+    distances = klotski.makeDistanceTable()
+    build_time = time.perf_counter() - start_time
+    print('{} solvable boards, furthest {} moves from solved, '
+          'built in {:.4f}s'.format(
+              len(distances), max(distances.values()), build_time))
+
+    start_time = time.perf_counter()
+    moves, expanded = klotski.forwardSolve(klotski.klotski_board)
+    solve_time = time.perf_counter() - start_time
+    print('{:<15} {:>6} {:>9.4f}'.format('solve()', len(moves), solve_time))
+    start_time = time.perf_counter()
+    moves = klotski.solveFromTable(distances, klotski.klotski_board)
+    solve_time = time.perf_counter() - start_time
+    print('{:<15} {:>6} {:>9.4f}'.format(
+        'from table', len(moves), solve_time))
+
+
+def benchRanking():
+    print('#### Dense ranking ####')
+    start = klotski.encode(klotski.klotski_board)
+    counts = klotski.countPieces(start)
+    total = klotski.countLayouts(0, counts)
+    states = reachableStates(start)
+    ranks = set()
+    for state in states:
+        rank = klotski.rankState(state)
+        assert 0 <= rank < total
+        assert klotski.unrankState(rank, counts) == state
+        ranks.add(rank)
+    assert len(ranks) == len(states)
+    print('{} layouts with these pieces, {} reachable'.format(
+        total, len(states)))
+
+    print('{:<18} {:>10} {:>9}'.format('', 'bytes', 'seconds'))
+    start_time = time.perf_counter()
+    distances = klotski.makeDistanceTable()
+    table_time = time.perf_counter() - start_time
+    table_size = sys.getsizeof(distances) + sum(
+        sys.getsizeof(state) for state in distances)
+    print('{:<18} {:>10} {:>9.4f}'.format(
+        'distance dict', table_size, table_time))
+    start_time = time.perf_counter()
+    distance_array = klotski.makeDistanceArray()
+    array_time = time.perf_counter() - start_time
+    assert all(distance_array[klotski.rankState(state)] == distance
+               for state, distance in distances.items())
+    print('{:<18} {:>10} {:>9.4f}'.format(
+        'distance array', sys.getsizeof(distance_array), array_time))
+
+    start_time = time.perf_counter()
+    seen = set(reachableStates(start))
+    set_time = time.perf_counter() - start_time
+    set_size = sys.getsizeof(seen) + sum(
+        sys.getsizeof(state) for state in seen)
+    print('{:<18} {:>10} {:>9.4f}'.format('visited set', set_size, set_time))
+    start_time = time.perf_counter()
+    sizes = klotski.findLayerSizes(klotski.klotski_board)
+    bitmap_time = time.perf_counter() - start_time
+    assert sum(sizes) == len(states)
+    print('{:<18} {:>10} {:>9.4f}'.format(
+        'visited bitmap', sys.getsizeof(bytearray((total + 7) // 8)),
+        bitmap_time))
+
+
+def benchBatch(searches=20):
+    print('#### Batch solving: boards.txt ####')
+    boards = klotski.readBoards(os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), 'boards.txt'))
+    start_time = time.perf_counter()
+    solutions = klotski.solveBatch(boards)
+    batch_time = time.perf_counter() - start_time
+    solved = [moves for moves in solutions if moves is not None]
+    print('{} boards, {} valid, {} solved in {:.4f}s ({:.6f}s each)'.format(
+        len(boards), sum(map(klotski.isValidBoard, boards)), len(solved),
+        batch_time, batch_time / len(boards)))
+
+    start_time = time.perf_counter()
+    searched = 0
+    for index in range(len(boards)):
+        if searched == searches:
+            break
+        if solutions[index] is None:
+            continue
+        moves, expanded = klotski.forwardSolve(boards[index])
+        assert len(moves) == len(solutions[index])
+        searched += 1
+    search_time = time.perf_counter() - start_time
+    print('{} boards searched separately in {:.4f}s ({:.6f}s each)'.format(
+        searched, search_time, search_time / searched))
+
+
+def benchDatabase():
+    print('#### Solution database ####')
+    path = os.path.join(tempfile.mkdtemp(), 'klotski.db')
+    start_time = time.perf_counter()
+    klotski_db.writeDatabase(path)
+    write_time = time.perf_counter() - start_time
+    print('written in {:.4f}s, {} bytes'.format(
+        write_time, os.path.getsize(path)))
+
+    start_time = time.perf_counter()
+    moves, expanded = klotski.forwardSolve(klotski.klotski_board)
+    solve_time = time.perf_counter() - start_time
+    start_time = time.perf_counter()
+    klotski.makeDistanceTable()
+    table_time = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    database = klotski_db.openDatabase(path)
+    found = klotski_db.lookupBoard(database, klotski.klotski_board)
+    open_time = time.perf_counter() - start_time
+
+    states = reachableStates(klotski.encode(klotski.klotski_board))
+    start_time = time.perf_counter()
+    for state in states:
+        klotski_db.lookupState(database, state)
+    lookup_time = (time.perf_counter() - start_time) / len(states)
+    klotski_db.closeDatabase(database)
+    os.remove(path)
+
+    print('{:<35} {:>12.6f}s'.format('solve() to first solution', solve_time))
+    print('{:<35} {:>12.6f}s'.format('makeDistanceTable()', table_time))
+    print('{:<35} {:>12.6f}s'.format('open database and first lookup',
+                                     open_time))
+    print('{:<35} {:>12.6f}s'.format('average lookup', lookup_time))
+    print('standard board: {} moves from solved, first move {}'.format(
+        found[0], found[1]))
+
+
+def benchParallel():
+    print('#### Parallel search: every reachable board ({} cores) ####'.format(
+        os.cpu_count()))
+    print('{:<10} {:>9} {:>9}'.format('workers', 'expanded', 'seconds'))
+    start_time = time.perf_counter()
+    expanded = len(reachableStates(klotski.encode(klotski.klotski_board)))
+    serial_time = time.perf_counter() - start_time
+    print('{:<10} {:>9} {:>9.4f}'.format('serial', expanded, serial_time))
+    for workers in [1, 2, 4, 8]:
+        start_time = time.perf_counter()
+        moves, expanded = klotski_parallel.solveParallel(
+            klotski.klotski_board, workers, full=True)
+        solve_time = time.perf_counter() - start_time
+        print('{:<10} {:>9} {:>9.4f}'.format(workers, expanded, solve_time))
+    start_time = time.perf_counter()
+    sizes = klotski.findLayerSizes(klotski.klotski_board)
+    serial_time = time.perf_counter() - start_time
+    print('{:<10} {:>9} {:>9.4f}'.format('bitmap', sum(sizes), serial_time))
+    for workers in [1, 2, 4, 8]:
+        start_time = time.perf_counter()
+        shared_sizes, distances = klotski_parallel.findLayersShared(
+            klotski.klotski_board, workers)
+        solve_time = time.perf_counter() - start_time
+        assert shared_sizes == sizes
+        print('{:<10} {:>9} {:>9.4f}'.format(
+            'shared ' + str(workers), sum(shared_sizes), solve_time))
+
+
+def layerSizes(board):
+    ''' layerSizes
+    Runs the layered search in expandLayer() until there are no new boards
+    left, returning the number of boards in each layer.
+    '''
+    board_dictionary = klotski.makeDictionary(board)
+    sizes = []
+    while True:
+        stats = klotski.layerStats(board_dictionary)
+        if stats['boards'] == 0:
+            return sizes
+        sizes.append(stats['boards'])
+        klotski.expandLayer(board_dictionary)
+
+def benchExternal():
+    print('#### External memory search: every reachable board ####')
+    print('{:<18} {:>9} {:>9} {:>10}'.format(
+        '', 'boards', 'seconds', 'peak'))
+    tracemalloc.start()
+    start_time = time.perf_counter()
+    sizes = layerSizes(klotski.klotski_board)
+    solve_time = time.perf_counter() - start_time
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print('{:<18} {:>9} {:>9.4f} {:>10}'.format(
+        'in memory', sum(sizes), solve_time, peak))
+    for chunk_size in [100000, 1000]:
+        tracemalloc.start()
+        start_time = time.perf_counter()
+        external_sizes, solutions = klotski_external.solveExternal(
+            klotski.klotski_board, chunk_size=chunk_size)
+        solve_time = time.perf_counter() - start_time
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        assert external_sizes == sizes
+        print('{:<18} {:>9} {:>9.4f} {:>10}'.format(
+            'chunks of ' + str(chunk_size), sum(external_sizes), solve_time,
+            peak))
+
+
+def benchNumpy():
+    print('#### NumPy layers: every reachable board ####')
+    try:
+        import klotski_numpy
+    except ImportError:
+        print('NumPy is not installed')
+        return
+    start_time = time.perf_counter()
+    states = reachableStates(klotski.encode(klotski.klotski_board))
+    serial_time = time.perf_counter() - start_time
+    start_time = time.perf_counter()
+    layers = klotski_numpy.findLayers(klotski.klotski_board)
+    numpy_time = time.perf_counter() - start_time
+    found = set()
+    for layer in layers:
+        found.update(klotski_numpy.unpackStates(layer))
+    assert found == set(states)
+    print('{:<10} {:>9} {:>9}'.format('', 'boards', 'seconds'))
+    print('{:<10} {:>9} {:>9.4f}'.format('python', len(states), serial_time))
+    print('{:<10} {:>9} {:>9.4f}'.format('numpy', len(found), numpy_time))
+
+
+if __name__ == '__main__':
+    layers = int(sys.argv[1]) if len(sys.argv) > 1 else 60
+    benchVisited(layers)
+    print()
+    benchEncoding(layers)
+    print()
+    benchParents(116)
+    print()
+    benchSuccessors()
+    print()
+    benchBidirectional()
+    print()
+    benchAStar()
+    print()
+    benchIDAStar()
+    print()
+    benchMirror()
+    print()
+    benchFrontier()
+    print()
+    benchSlides()
+    print()
+    benchDistanceTable()
+    print()
+    benchRanking()
+    print()
+    benchBatch()
+    print()
+    benchDatabase()
+    print()
+    benchParallel()
+    print()
+    benchExternal()
+    print()
+    benchNumpy()
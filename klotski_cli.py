@@ -0,0 +1,107 @@
+''' Klotski command line
+
+    Solves boards with any of the searches in klotski.py, printing an
+    optimal solution for each without waiting for input (klotski.py itself
+    runs the original interactive search, and klotski_timed.py times it).
+
+    Usage:
+        python klotski_cli.py [--engine ENGINE] [--boards PATH] [--quiet]
+                              [--stats]
+
+    Solves the standard board, or every board in the file PATH (in the
+    boards.txt format, see klotski.readBoards).  ENGINE is one of:
+        - bfs: the layered search in klotski.expandLayer() (the default)
+        - bidirectional: klotski.solveBidirectional()
+        - astar: klotski.solveAStar()
+        - idastar: klotski.solveIDAStar()
+        - slides: klotski.solveSlides(), counting each slide as one move
+        - table: klotski.solveBatch(), one table for all the boards
+    With --quiet only the number of moves is printed, not the boards.  With
+    --stats every layer of the bfs search is run instead, printing the
+    measurements of each layer from klotski.measureLayers() as JSON lines.
+
+@author = R Soane
+'''
+
+import argparse
+import sys
+import time
+
+import klotski
+
+engines = ['bfs', 'bidirectional', 'astar', 'idastar', 'slides', 'table']
+
+
+def solveBoard(board, engine, cache):
+    ''' solveBoard
+    Solves board with the named engine, returning the single cell moves of
+    the solution (None if there is no solution) and the number of moves
+    counted by that engine.  cache is passed to klotski.solveBatch() by
+    the table engine.
+    '''
+    if engine == 'bfs':
+        for moves, length in klotski.findSolutions(
+                klotski.makeDictionary(board), limit=1):
+            return moves, length
+        return None, None
+    if engine == 'bidirectional':
+        moves = klotski.solveBidirectional(board)[0]
+    elif engine == 'astar':
+        moves = klotski.solveAStar(board)[0]
+    elif engine == 'idastar':
+        moves = klotski.solveIDAStar(board)[0]
+    elif engine == 'slides':
+        slides = klotski.solveSlides(board)[0]
+        if slides is None:
+            return None, None
+        return [move for slide in slides for move in slide], len(slides)
+    else:
+        moves = klotski.solveBatch([board], cache)[0]
+    if moves is None:
+        return None, None
+    return moves, len(moves)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Find optimal solutions to Klotski boards')
+    parser.add_argument('--engine', choices=engines, default='bfs',
+                        help='the search to use (default bfs)')
+    parser.add_argument('--boards', metavar='PATH',
+                        help='a file of boards to solve, as boards.txt')
+    parser.add_argument('--quiet', action='store_true',
+                        help='only print the number of moves')
+    parser.add_argument('--stats', action='store_true',
+                        help='print measurements of every layer as JSON')
+    args = parser.parse_args(argv)
+
+    if args.boards:
+        boards = klotski.readBoards(args.boards)
+    else:
+        boards = [klotski.klotski_board]
+    cache = {}
+    for index in range(len(boards)):
+        board = boards[index]
+        if not klotski.isValidBoard(board):
+            print('Board {}: not a valid board'.format(index + 1))
+            continue
+        # Number the pieces, so moveBoard() can follow the moves
+        board = klotski.decode(klotski.encode(board))
+        if args.stats:
+            klotski.measureLayers(klotski.makeDictionary(board))
+            continue
+        start_time = time.perf_counter()
+        moves, length = solveBoard(board, args.engine, cache)
+        solve_time = time.perf_counter() - start_time
+        if moves is None:
+            print('Board {}: no solution ({:.4f}s)'.format(
+                index + 1, solve_time))
+            continue
+        print('Board {}: solved in {} moves ({:.4f}s)'.format(
+            index + 1, length, solve_time))
+        if not args.quiet:
+            klotski.printBoards(moves, board)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,137 @@
+''' Klotski solution database
+
+    Stores the table made by klotski.makeDistanceTable() in a file, so it
+    can be used without searching again.  The file is opened with mmap and
+    searched where it is, so opening it doesn't read or parse anything and
+    a lookup only reads the few records it compares against.
+
+    File format:
+        - header: the 8 bytes b'KLOTSKI1', then the number of records as 4
+          bytes (big endian)
+        - records: one per board, sorted by encoded board, each of
+            - the encoded board, as 10 bytes (big endian)
+            - the number of moves from solved, as 1 byte
+            - the first move of an optimal solution packed by
+              klotski.encodeMove(), as 1 byte (255 for solved boards)
+
+    As the boards are big endian, sorting the records by their bytes sorts
+    them by encoded board, so a lookup is a binary search of the file.
+
+    Usage:
+        python klotski_db.py [path]
+    writes the database for the standard pieces to path (klotski.db by
+    default).
+
+@author = R Soane
+'''
+
+import mmap
+import sys
+
+import klotski
+
+magic = b'KLOTSKI1'
+header_size = 12
+key_size = 10
+record_size = 12
+no_move = 255
+
+
+def writeDatabase(path, distances=None):
+    ''' writeDatabase
+    Writes a database file at path from a table made by makeDistanceTable()
+    (by default the table for the standard pieces).
+    '''
+    if distances is None:
+        distances = klotski.makeDistanceTable()
+    with open(path, 'wb') as f:
+        f.write(magic + len(distances).to_bytes(4, 'big'))
+        for state in sorted(distances):
+            distance = distances[state]
+            move = no_move
+            for key in klotski.findNextStates(state):
+                if distances.get(key) == distance - 1:
+                    move = klotski.encodeMove(klotski.findMove(state, key))
+                    break
+            f.write(state.to_bytes(key_size, 'big') + bytes([distance, move]))
+
+def openDatabase(path):
+    ''' openDatabase
+    Maps a database file into memory, returning a dictionary holding the
+    open file, the map and the number of records
+    '''
+    f = open(path, 'rb')
+    data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if data[:len(magic)] != magic:
+        data.close()
+        f.close()
+        raise ValueError('{} is not a klotski database'.format(path))
+    return {
+        'file': f,
+        'map': data,
+        'count': int.from_bytes(data[len(magic):header_size], 'big')
+    }
+
+def closeDatabase(database):
+    database['map'].close()
+    database['file'].close()
+
+def lookupState(database, state):
+    ''' lookupState
+    Finds an encoded board in the database.  Returns its number of moves
+    from solved and the first move of an optimal solution (None if it is
+    solved), or None if the board can't be solved.
+    '''
+    data = database['map']
+    key = state.to_bytes(key_size, 'big')
+    low, high = 0, database['count']
+    while low < high:
+        middle = (low + high) // 2
+        start = header_size + middle * record_size
+        record_key = data[start:start + key_size]
+        if record_key < key:
+            low = middle + 1
+        elif record_key > key:
+            high = middle
+        else:
+            distance = data[start + key_size]
+            move = data[start + key_size + 1]
+            if move == no_move:
+                return distance, None
+            return distance, klotski.decodeMove(move)
+    return None
+
+def lookupBoard(database, board):
+    ''' lookupBoard
+    lookupState() for a board
+    '''
+    return lookupState(database, klotski.encode(board))
+
+def solveFromDatabase(database, board):
+    ''' solveFromDatabase
+    Finds an optimal solution from board by following the moves stored in
+    the database.  Returns the moves, or None if board can't be solved.
+    '''
+    state = klotski.encode(board)
+    found = lookupState(database, state)
+    if found is None:
+        return None
+    moves = []
+    while found[1] is not None:
+        moves.append(found[1])
+        # Follow the move on the encoded board, so boards with unnumbered
+        # pieces (as from readBoards) work as well
+        for key in klotski.findNextStates(state):
+            if klotski.findMove(state, key) == found[1]:
+                state = key
+                break
+        found = lookupState(database, state)
+    return moves
+
+
+if __name__ == '__main__':
+    path = sys.argv[1] if len(sys.argv) > 1 else 'klotski.db'
+    writeDatabase(path)
+    database = openDatabase(path)
+    print('Wrote {} boards to {}'.format(database['count'], path))
+    closeDatabase(database)
@@ -0,0 +1,208 @@
+''' Klotski external memory search
+
+    A layered search like klotski.solve(), for when the boards seen won't
+    fit in memory.  Each layer is kept in a file on disk, as its encoded
+    boards sorted and packed as in klotski_db.py (10 bytes each, big
+    endian), and no layer is ever read into memory all at once.  For each
+    layer:
+        - the layer file is read a chunk at a time, and the boards one move
+          on from each chunk are sorted and written to a run file
+        - the run files are merged, dropping repeats and any boards in the
+          current or previous layer files, into the next layer's file
+    Every move can be undone, so a board one move on from a board in layer
+    d can only be in layer d - 1, d or d + 1.  So checking against the last
+    two layers drops every board seen before, without keeping them.
+
+    As in solve(), solved boards aren't carried forward, and the number of
+    boards in each layer is the same as solve() finds.  The moves of each
+    solution are found afterwards by looking back through the layer files
+    for a board one move before, with a binary search of each file.
+
+    Usage:
+        python klotski_external.py [directory]
+    keeps the layer files in directory (a temporary directory by default).
+
+@author = R Soane
+'''
+
+import heapq
+import os
+import sys
+import tempfile
+
+import klotski
+import klotski_db
+
+key_size = klotski_db.key_size
+
+
+def layerPath(directory, layer):
+    return os.path.join(directory, 'layer{}.bin'.format(layer))
+
+def writeStates(path, states):
+    ''' writeStates
+    Writes an iterable of encoded boards to a file at path, returning the
+    number written
+    '''
+    count = 0
+    with open(path, 'wb') as f:
+        for state in states:
+            f.write(state.to_bytes(key_size, 'big'))
+            count += 1
+    return count
+
+def readStates(path, chunk_size):
+    ''' readStates
+    Reads the encoded boards in a file written by writeStates() one at a
+    time, reading chunk_size boards from the file at once
+    '''
+    with open(path, 'rb') as f:
+        while True:
+            data = f.read(chunk_size * key_size)
+            if not data:
+                return
+            for start in range(0, len(data), key_size):
+                yield int.from_bytes(data[start:start + key_size], 'big')
+
+def readChunks(path, chunk_size):
+    ''' readChunks
+    Reads the encoded boards in a file written by writeStates() as lists of
+    up to chunk_size boards
+    '''
+    chunk = []
+    for state in readStates(path, chunk_size):
+        chunk.append(state)
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def mergeRuns(paths, exclude_paths, buffer_size):
+    ''' mergeRuns
+    Merges the sorted files at paths, yielding each board once in order,
+    and dropping the boards in any of the sorted files at exclude_paths
+    '''
+    states = heapq.merge(*[readStates(path, buffer_size) for path in paths])
+    excluded = heapq.merge(*[readStates(path, buffer_size)
+                             for path in exclude_paths])
+    exclude = next(excluded, None)
+    previous = None
+    for state in states:
+        if state == previous:
+            continue
+        previous = state
+        while exclude is not None and exclude < state:
+            exclude = next(excluded, None)
+        if state != exclude:
+            yield state
+
+def findInLayer(f, count, state):
+    ''' findInLayer
+    Checks whether an encoded board is in the open layer file f holding
+    count boards, with a binary search of the file
+    '''
+    key = state.to_bytes(key_size, 'big')
+    low, high = 0, count
+    while low < high:
+        middle = (low + high) // 2
+        f.seek(middle * key_size)
+        record_key = f.read(key_size)
+        if record_key < key:
+            low = middle + 1
+        elif record_key > key:
+            high = middle
+        else:
+            return True
+    return False
+
+def findPath(directory, sizes, layer, state):
+    ''' findPath
+    Finds the moves from the start to an encoded board in the layer file
+    numbered layer, by looking for a board one move before in each
+    earlier layer file in turn
+    '''
+    states = [state]
+    while layer > 0:
+        layer -= 1
+        with open(layerPath(directory, layer), 'rb') as f:
+            for key in klotski.findNextStates(states[-1]):
+                if findInLayer(f, sizes[layer], key):
+                    states.append(key)
+                    break
+    states.reverse()
+    moves = []
+    for index in range(1, len(states)):
+        moves.append(klotski.findMove(states[index - 1], states[index]))
+    return moves
+
+def searchLayers(board, directory, chunk_size=100000, buffer_size=1000):
+    ''' searchLayers
+    Searches every board reachable from board one layer at a time, keeping
+    the layers in files in directory.  At most chunk_size boards of a layer
+    (and the boards one move on from them) are held in memory at once, and
+    buffer_size boards from each file being merged.  Returns the number of
+    boards in each layer, and the moves of each solution found, layer by
+    layer.
+    '''
+    start = klotski.encode(board)
+    sizes = [writeStates(layerPath(directory, 0), [start])]
+    found = []
+    layer = 0
+    while sizes[layer] > 0:
+        # Sort the boards one move on from each chunk into a run file
+        runs = []
+        for chunk in readChunks(layerPath(directory, layer), chunk_size):
+            new_states = []
+            for state in chunk:
+                for key in klotski.findNextStates(state):
+                    if key & klotski.solved_bit:
+                        found.append((layer, state, key))
+                    else:
+                        new_states.append(key)
+            new_states.sort()
+            path = os.path.join(directory, 'run{}.bin'.format(len(runs)))
+            writeStates(path, new_states)
+            runs.append(path)
+
+        # Merge the runs, dropping boards in this layer or the one before
+        exclude_paths = [layerPath(directory, layer)]
+        if layer > 0:
+            exclude_paths.append(layerPath(directory, layer - 1))
+        sizes.append(writeStates(
+            layerPath(directory, layer + 1),
+            mergeRuns(runs, exclude_paths, buffer_size)))
+        for path in runs:
+            os.remove(path)
+        layer += 1
+    sizes.pop()
+
+    solutions = []
+    for layer, state, key in found:
+        moves = findPath(directory, sizes, layer, state)
+        moves.append(klotski.findMove(state, key))
+        solutions.append(moves)
+    return sizes, solutions
+
+def solveExternal(board, directory=None, chunk_size=100000):
+    ''' solveExternal
+    searchLayers(), keeping the layer files in a temporary directory which
+    is removed afterwards if directory isn't given
+    '''
+    if directory is not None:
+        return searchLayers(board, directory, chunk_size)
+    with tempfile.TemporaryDirectory() as directory:
+        return searchLayers(board, directory, chunk_size)
+
+
+if __name__ == '__main__':
+    directory = sys.argv[1] if len(sys.argv) > 1 else None
+    sizes, solutions = solveExternal(klotski.klotski_board, directory)
+    checked = 0
+    for layer in range(len(sizes)):
+        checked += sizes[layer]
+        print('Starting Layer {}, checked {} board layouts'.format(
+            layer + 1, checked))
+    print('Checked all {} board layouts'.format(checked))
+    print('Found {} solutions, the first in {} moves'.format(
+        len(solutions), len(solutions[0])))
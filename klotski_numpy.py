@@ -0,0 +1,163 @@
+''' Klotski layers with NumPy
+
+    A layered search like klotski.solve(), with each layer held as a NumPy
+    array and every board in the layer moved at once, for finding every
+    reachable board.  Needs NumPy.
+
+    The encoded boards from klotski.encode() are 80 bits, too big for a
+    NumPy integer, so boards are packed into 64 bits here: the W, B and P
+    masks as they are in the encoded board (60 bits), then the position of
+    R1 as row*3 + column (4 bits).  So boards must have exactly one R1.
+
+    Every move in klotski.move_table is tried on every board in the layer
+    at once, as a table with one row per board and one column per move.
+    The moves where the piece is in place and the cells it moves into are
+    empty are picked out, and made by XORing with the move's bits.  The new
+    boards are then sorted to drop repeats, and the boards already seen
+    found with a binary search of the sorted boards seen.
+
+    Usage:
+        python klotski_numpy.py
+
+@author = R Soane
+'''
+
+import numpy as np
+
+import klotski
+
+low_mask = (1 << 60) - 1
+
+
+def makeTables():
+    ''' makeTables
+    Works out the tables used to move whole layers at once, as NumPy arrays:
+        - the cells covered by R1 at each packed position
+        - for each move of a W, B or P piece, the bit which must be set for
+          the piece to be there, the cells which must be empty and the bits
+          to flip
+        - for each move of R1, its packed position before the move, the
+          cells which must be empty and the bits to flip
+    '''
+    r_cells = np.zeros(16, dtype=np.uint64)
+    for position in range(12):
+        i, j = position // 3, position % 3
+        r_cells[position] = klotski.findOccupied(1 << (60 + i*4 + j))
+    moves = [[], [], []]
+    r_moves = [[], [], []]
+    for index in range(len(klotski.move_table)):
+        for need, flip in klotski.move_table[index]:
+            if index < 60:
+                moves[0].append(index)
+                moves[1].append(need)
+                moves[2].append(flip)
+            else:
+                old = index - 60
+                new = ((flip >> 60) ^ (1 << old)).bit_length() - 1
+                old, new = packPosition(old), packPosition(new)
+                r_moves[0].append(old)
+                r_moves[1].append(need)
+                r_moves[2].append((old ^ new) << 60)
+    moves = [np.array(column, dtype=np.uint64) for column in moves]
+    r_moves = [np.array(column, dtype=np.uint64) for column in r_moves]
+    return r_cells, moves, r_moves
+
+def packPosition(k):
+    ''' packPosition
+    The packed position of R1 with its top left cell at cell k
+    '''
+    return (k // 4)*3 + k % 4
+
+def packStates(states):
+    ''' packStates
+    Packs a list of encoded boards into a NumPy array.  Raises ValueError
+    for a board without exactly one R1.
+    '''
+    packed = []
+    for state in states:
+        r_mask = state >> 60
+        if r_mask == 0 or r_mask & (r_mask - 1):
+            raise ValueError('boards must have exactly one R1 to be packed')
+        r = r_mask.bit_length() - 1
+        packed.append((state & low_mask) | (packPosition(r) << 60))
+    return np.array(packed, dtype=np.uint64)
+
+def unpackStates(packed):
+    ''' unpackStates
+    Unpacks a NumPy array made by packStates() into a list of encoded boards
+    '''
+    states = []
+    for value in packed.tolist():
+        position = value >> 60
+        r = (position // 3)*4 + position % 3
+        states.append((value & low_mask) | (1 << (60 + r)))
+    return states
+
+r_cells, layer_moves, r_layer_moves = makeTables()
+
+def expandArray(layer):
+    ''' expandArray
+    Finds every packed board one move on from every packed board in the
+    NumPy array layer (with repeats)
+    '''
+    mask = np.uint64(klotski.full_mask)
+    w = layer & mask
+    b = (layer >> np.uint64(20)) & mask
+    p = (layer >> np.uint64(40)) & mask
+    r = layer >> np.uint64(60)
+    occupied = (w | b | (b << np.uint64(4)) | p | (p << np.uint64(1)) |
+                r_cells[r])
+
+    # One row per board, one column per move
+    layer = layer[:, None]
+    occupied = occupied[:, None]
+    indexes, needs, flips = layer_moves
+    picked = ((layer >> indexes) & np.uint64(1)) != 0
+    picked &= (occupied & needs) == 0
+    new_layer = (layer ^ flips)[picked]
+
+    olds, needs, flips = r_layer_moves
+    picked = (r[:, None] == olds) & ((occupied & needs) == 0)
+    return np.concatenate([new_layer, (layer ^ flips)[picked]])
+
+def sortUnique(array):
+    ''' sortUnique
+    Sorts a NumPy array and drops repeats (as np.unique, which can be slow
+    for arrays of this size)
+    '''
+    array = np.sort(array)
+    if len(array) == 0:
+        return array
+    keep = np.empty(len(array), dtype=bool)
+    keep[0] = True
+    keep[1:] = array[1:] != array[:-1]
+    return array[keep]
+
+def dropSeen(array, seen):
+    ''' dropSeen
+    Drops the values of the sorted NumPy array array which are in the sorted
+    NumPy array seen (as np.isin, using a binary search of seen)
+    '''
+    found = np.searchsorted(seen, array)
+    found[found == len(seen)] = 0
+    return array[seen[found] != array]
+
+def findLayers(board):
+    ''' findLayers
+    Finds every board reachable from board, one layer at a time.  Returns
+    the list of layers, each a sorted NumPy array of packed boards.
+    '''
+    layer = packStates([klotski.encode(board)])
+    seen = layer
+    layers = [layer]
+    while len(layer):
+        layer = dropSeen(sortUnique(expandArray(layer)), seen)
+        seen = np.sort(np.concatenate([seen, layer]))
+        if len(layer):
+            layers.append(layer)
+    return layers
+
+if __name__ == '__main__':
+    layers = findLayers(klotski.klotski_board)
+    print('Found {} boards in {} layers'.format(
+        sum(len(layer) for layer in layers), len(layers)))
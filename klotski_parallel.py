@@ -0,0 +1,271 @@
+''' Klotski parallel search
+
+    A layered search like klotski.solve(), with each layer expanded by a
+    pool of worker processes.
+
+    Each board belongs to one worker, chosen from a hash of the encoded
+    board (see findOwner).  A worker keeps the boards it owns which have
+    been seen (with their parents), and the part of the current layer it
+    owns.  For each layer:
+        - every worker finds the boards one move on from its part of the
+          layer, and sorts them by owner
+        - the boards are passed to their owners, which drop any they have
+          seen, and keep the rest as their part of the next layer
+    So each board is only ever checked against one worker's boards, and
+    the boards seen are split between the workers rather than copied.
+
+    findLayersShared() finds every reachable board the same way, but with
+    the boards seen kept in shared memory, as a bitmap and an array of
+    moves from the start indexed by klotski.rankState().  Each worker owns
+    a block of ranks (a whole number of bytes of the bitmap) and is the
+    only process which writes to its block, so no locking is needed, and
+    only the new boards are passed between processes.
+
+    Usage:
+        python klotski_parallel.py [workers]
+
+@author = R Soane
+'''
+
+import multiprocessing
+from multiprocessing import shared_memory
+import sys
+
+import klotski
+
+
+def findOwner(state, workers):
+    ''' findOwner
+    The worker which owns an encoded board.  The bits of an encoded board
+    are far from random, so they are mixed before taking the remainder.
+    '''
+    return ((state * 0x9E3779B97F4A7C15) >> 64) % workers
+
+def runWorker(connection, workers):
+    ''' runWorker
+    The loop run by each worker process, answering the requests sent by
+    solveParallel() through connection
+    '''
+    parents = {}
+    boards = []
+    while True:
+        request = connection.recv()
+        if request[0] == 'add':
+            # Drop the boards already seen, keep the rest as the next layer
+            boards = []
+            solved = []
+            for state, parent in zip(request[1], request[2]):
+                if state in parents:
+                    continue
+                parents[state] = parent
+                boards.append(state)
+                if state & klotski.solved_bit:
+                    solved.append(state)
+            connection.send((len(boards), solved))
+        elif request[0] == 'expand':
+            # Sort the boards one move on by owner
+            new_boards = [[] for i in range(workers)]
+            new_parents = [[] for i in range(workers)]
+            for state in boards:
+                for key in klotski.findNextStates(state):
+                    owner = findOwner(key, workers)
+                    new_boards[owner].append(key)
+                    new_parents[owner].append(state)
+            connection.send((new_boards, new_parents))
+        elif request[0] == 'parent':
+            connection.send(parents[request[1]])
+        else:
+            connection.close()
+            return
+
+def solveParallel(board, workers=4, full=False):
+    ''' solveParallel
+    Searches layer by layer from board with a pool of worker processes,
+    until the first layer holding a solution (or, if full is True, until
+    every reachable board has been found).  Returns the moves of the first
+    solution found (None if there isn't one) and the number of boards
+    expanded.
+    '''
+    connections = []
+    processes = []
+    for index in range(workers):
+        connection, worker_connection = multiprocessing.Pipe()
+        process = multiprocessing.Process(target=runWorker,
+                                          args=(worker_connection, workers))
+        process.start()
+        connections.append(connection)
+        processes.append(process)
+
+    try:
+        start = klotski.encode(board)
+        for index in range(workers):
+            if findOwner(start, workers) == index:
+                connections[index].send(('add', [start], [None]))
+            else:
+                connections[index].send(('add', [], []))
+        results = [connection.recv() for connection in connections]
+        expanded = 0
+        solution = None
+
+        while True:
+            layer_size = sum(result[0] for result in results)
+            solved = [state for result in results for state in result[1]]
+            if solved and solution is None:
+                solution = solved[0]
+                if not full:
+                    break
+            if layer_size == 0:
+                break
+            expanded += layer_size
+
+            for connection in connections:
+                connection.send(('expand',))
+            sent = [connection.recv() for connection in connections]
+            for index in range(workers):
+                new_boards = []
+                new_parents = []
+                for boards, parents in sent:
+                    new_boards += boards[index]
+                    new_parents += parents[index]
+                connections[index].send(('add', new_boards, new_parents))
+            results = [connection.recv() for connection in connections]
+
+        if solution is None:
+            return None, expanded
+
+        # Ask the owners for the parents back to the start
+        states = [solution]
+        while True:
+            connection = connections[findOwner(states[-1], workers)]
+            connection.send(('parent', states[-1]))
+            parent = connection.recv()
+            if parent is None:
+                break
+            states.append(parent)
+        states.reverse()
+        moves = []
+        for index in range(1, len(states)):
+            moves.append(klotski.findMove(states[index - 1], states[index]))
+        return moves, expanded
+
+    finally:
+        for connection in connections:
+            connection.send(('stop',))
+        for process in processes:
+            process.join()
+
+
+def runSharedWorker(connection, name, counts, block, workers, bitmap_size):
+    ''' runSharedWorker
+    The loop run by each worker process of findLayersShared(), answering
+    its requests through connection.  The worker owns the ranks from
+    index*block to (index + 1)*block of the boards seen, in the shared
+    memory called name (the bitmap in its first bitmap_size bytes, then
+    the distances).
+    '''
+    memory = shared_memory.SharedMemory(name=name)
+    total = klotski.countLayouts(0, counts)
+    seen = memory.buf[:bitmap_size]
+    distances = memory.buf[bitmap_size:bitmap_size + total]
+    ranks = []
+    while True:
+        request = connection.recv()
+        if request[0] == 'add':
+            # Claim the boards not yet seen as this worker's next layer
+            ranks = []
+            for rank in request[1]:
+                if not seen[rank >> 3] & (1 << (rank & 7)):
+                    seen[rank >> 3] |= 1 << (rank & 7)
+                    distances[rank] = request[2]
+                    ranks.append(rank)
+            connection.send(len(ranks))
+        elif request[0] == 'expand':
+            # Sort the ranks of the boards one move on by owner
+            new_ranks = [[] for i in range(workers)]
+            for rank in ranks:
+                state = klotski.unrankState(rank, counts)
+                for key in klotski.findNextStates(state):
+                    key_rank = klotski.rankState(key)
+                    new_ranks[key_rank // block].append(key_rank)
+            connection.send(new_ranks)
+        else:
+            del seen, distances
+            memory.close()
+            connection.close()
+            return
+
+def countShared(counts):
+    ''' countShared
+    The sizes in bytes of the bitmap and distance array for boards with
+    the pieces in counts (as from klotski.countPieces)
+    '''
+    total = klotski.countLayouts(0, counts)
+    return (total + 7) // 8, total
+
+def findLayersShared(board, workers=4):
+    ''' findLayersShared
+    Finds every board reachable from board layer by layer with a pool of
+    worker processes sharing the boards seen.  Returns the number of
+    boards in each layer, and a bytearray of the number of moves from
+    board to each board indexed by klotski.rankState() (255 for boards
+    which can't be reached).
+    '''
+    start = klotski.encode(board)
+    counts = klotski.countPieces(start)
+    bitmap_size, total = countShared(counts)
+    block = -(-bitmap_size // workers) * 8
+    memory = shared_memory.SharedMemory(create=True,
+                                        size=bitmap_size + total)
+    connections = []
+    processes = []
+    try:
+        # The block may be rounded up to a whole page, so slice explicitly
+        memory.buf[:bitmap_size] = bytes(bitmap_size)
+        memory.buf[bitmap_size:bitmap_size + total] = bytes([255]) * total
+        for index in range(workers):
+            connection, worker_connection = multiprocessing.Pipe()
+            process = multiprocessing.Process(
+                target=runSharedWorker,
+                args=(worker_connection, memory.name, counts, block, workers,
+                      bitmap_size))
+            process.start()
+            connections.append(connection)
+            processes.append(process)
+
+        rank = klotski.rankState(start)
+        for index in range(workers):
+            connections[index].send(
+                ('add', [rank] if rank // block == index else [], 0))
+        sizes = []
+        while True:
+            layer_size = sum(connection.recv() for connection in connections)
+            if layer_size == 0:
+                break
+            if len(sizes) == 255:
+                raise ValueError('boards more than 254 moves from the start')
+            sizes.append(layer_size)
+            for connection in connections:
+                connection.send(('expand',))
+            sent = [connection.recv() for connection in connections]
+            for index in range(workers):
+                new_ranks = []
+                for ranks in sent:
+                    new_ranks += ranks[index]
+                connections[index].send(('add', new_ranks, len(sizes)))
+        return sizes, bytearray(memory.buf[bitmap_size:bitmap_size + total])
+
+    finally:
+        for connection in connections:
+            connection.send(('stop',))
+        for process in processes:
+            process.join()
+        memory.close()
+        memory.unlink()
+
+
+if __name__ == '__main__':
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    moves, expanded = solveParallel(klotski.klotski_board, workers)
+    print('Solved in {} moves with {} workers, expanded {} boards'.format(
+        len(moves), workers, expanded))
+    klotski.printBoards(moves)
@@ -0,0 +1,192 @@
+''' Klotski benchmark suite
+
+    Times each search in klotski.py on a corpus of starting boards, so
+    changes to the searches can be checked for slowdowns.  The corpus is
+    some of the classic named Huarong Dao boards (with the best known
+    solutions in slides, which solveSlides() finds), and a few harder
+    boards:
+        - heng dao li ma (the standard board, klotski_board): 81 slides
+        - zhi hui ruo ding (command with ease): 70 slides
+        - qi tou bing jin (side by side): 60 slides
+        - bing fen san lu (three pronged attack): 72 slides
+        - zuo you bu bing (soldiers on both sides): 54 slides
+        - furthest: a board with the standard pieces as far from solved as
+          any (126 moves)
+        - two horizontals: two P pieces and two B pieces, with about seven
+          times as many boards reachable as the standard board
+
+    Each search is run on each board a number of times after warming up,
+    timing every run and keeping the fastest, then once more with
+    tracemalloc on for the peak memory.  For each it records the moves of
+    the solution, the boards expanded, the time to the (first) solution,
+    the boards expanded per second and the peak memory.
+
+    The results can be saved as JSON, and compared against results saved
+    before: any run which now finds a different number of moves, or takes
+    longer by more than the tolerance, is reported as a regression (and
+    the exit status is 1).  Times depend on the machine, so no timed
+    baseline is included - save one with --save first, then compare
+    against it with --compare.  klotski_baseline.json holds just the
+    number of moves each search finds from each board, which doesn't
+    depend on the machine, so comparing against it checks the searches
+    still find the same solutions.  IDA* isn't included, as from most of
+    these boards it takes minutes.
+
+    Usage:
+        python klotski_suite.py [--repeat N] [--warmup N] [--save PATH]
+                                [--compare PATH] [--tolerance T]
+
+@author = R Soane
+'''
+
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+
+import klotski
+
+corpus = [
+    ['heng dao li ma', 'BRRB BRRB BPPB BWWB WXXW'],
+    ['zhi hui ruo ding', 'BRRB BRRB WPPW BWWB BXXB'],
+    ['qi tou bing jin', 'BRRB BRRB WWWW BPPB BXXB'],
+    ['bing fen san lu', 'WRRW BRRB BPPB BWWB BXXB'],
+    ['zuo you bu bing', 'WRRW WRRW BBBB BBBB XPPX'],
+    ['furthest', 'XBRR XBRR PPBW BWBB BWWB'],
+    ['two horizontals', 'BRRB BRRB PPPP WWWW XWWX']
+]
+
+engines = [
+    ['bfs', klotski.forwardSolve],
+    ['bidirectional', klotski.solveBidirectional],
+    ['astar', klotski.solveAStar],
+    ['frontier', klotski.solveFrontier],
+    ['slides', klotski.solveSlides]
+]
+
+
+def makeBoard(layout):
+    ''' makeBoard
+    Makes a board from a layout written as the piece type letter (or X) of
+    each cell, a row at a time with the rows separated by spaces
+    '''
+    return klotski.decode(klotski.encode([list(row)
+                                          for row in layout.split()]))
+
+def runEngine(solve, board, repeat, warmup):
+    ''' runEngine
+    Runs solve on board warmup times untimed, then repeat times timed, then
+    once with tracemalloc on.  Returns the measurements as a dictionary.
+    '''
+    if repeat < 1:
+        raise ValueError('repeat must be at least 1')
+    for _ in range(warmup):
+        solve(board)
+    times = []
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        moves, expanded = solve(board)
+        times.append(time.perf_counter() - start_time)
+    tracemalloc.start()
+    solve(board)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {
+        'moves': None if moves is None else len(moves),
+        'expanded': expanded,
+        'seconds': min(times),
+        'states_per_second': expanded / min(times),
+        'peak': peak
+    }
+
+def runSuite(repeat=3, warmup=1, output=None):
+    ''' runSuite
+    Runs every engine on every board in the corpus, printing a line for
+    each to output (stdout by default).  Returns the results as a
+    dictionary by board name then engine name.
+    '''
+    if output is None:
+        output = sys.stdout
+    results = {}
+    output.write('{:<17} {:<14} {:>6} {:>9} {:>9} {:>11} {:>10}\n'.format(
+        'board', 'engine', 'moves', 'expanded', 'seconds', 'boards/s',
+        'peak'))
+    for name, layout in corpus:
+        board = makeBoard(layout)
+        results[name] = {}
+        for engine, solve in engines:
+            result = runEngine(solve, board, repeat, warmup)
+            results[name][engine] = result
+            output.write(
+                '{:<17} {:<14} {:>6} {:>9} {:>9.4f} {:>11.0f} {:>10}\n'.format(
+                    name, engine, str(result['moves']), result['expanded'],
+                    result['seconds'], result['states_per_second'],
+                    result['peak']))
+    return results
+
+def compareResults(results, baseline, tolerance=0.25):
+    ''' compareResults
+    Compares results from runSuite() against a baseline saved before.
+    Returns a list of messages, one for each run which finds a different
+    number of moves, or is slower than the baseline by more than the
+    fraction tolerance (if the baseline has times).
+    '''
+    regressions = []
+    for name in results:
+        for engine in results[name]:
+            old = baseline.get(name, {}).get(engine)
+            if old is None:
+                continue
+            new = results[name][engine]
+            if new['moves'] != old['moves']:
+                regressions.append('{} {}: {} moves, was {}'.format(
+                    name, engine, new['moves'], old['moves']))
+            if ('seconds' in old and
+                    new['seconds'] > old['seconds'] * (1 + tolerance)):
+                regressions.append('{} {}: {:.4f}s, was {:.4f}s'.format(
+                    name, engine, new['seconds'], old['seconds']))
+    return regressions
+
+def positiveInt(text):
+    ''' positiveInt
+    An argparse type for whole numbers of at least 1
+    '''
+    value = int(text)
+    if value < 1:
+        raise argparse.ArgumentTypeError('must be at least 1')
+    return value
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Time the Klotski searches on a corpus of boards')
+    parser.add_argument('--repeat', type=positiveInt, default=3,
+                        help='timed runs of each search (default 3)')
+    parser.add_argument('--warmup', type=int, default=1,
+                        help='untimed runs first (default 1)')
+    parser.add_argument('--save', metavar='PATH',
+                        help='save the results as JSON')
+    parser.add_argument('--compare', metavar='PATH',
+                        help='compare against results saved before')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='slowdown allowed, as a fraction (default 0.25)')
+    args = parser.parse_args(argv)
+
+    results = runSuite(args.repeat, args.warmup)
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(results, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compareResults(results, baseline, args.tolerance)
+        for message in regressions:
+            print('Regression: ' + message)
+        if regressions:
+            return 1
+        print('No regressions against ' + args.compare)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
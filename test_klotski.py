@@ -0,0 +1,318 @@
+''' Klotski tests
+
+    Checks the move generation against the original findValidMoves() and
+    moveBoard(), and every search against the table of moves from solved
+    made by klotski.makeDistanceTable(), on a sample of boards, a solved
+    board and a board which can't be solved.
+
+    Usage:
+        python -m pytest test_klotski.py
+
+@author = R Soane
+'''
+
+import os
+import random
+
+import pytest
+
+import klotski
+import klotski_db
+import klotski_external
+import klotski_parallel
+
+
+def reachableStates(start):
+    states = [start]
+    seen = {start}
+    for state in states:
+        for new_state in klotski.findNextStates(state):
+            if new_state not in seen:
+                seen.add(new_state)
+                states.append(new_state)
+    return states
+
+def findDistances(start):
+    ''' findDistances
+    The number of moves to each board reachable from the encoded board
+    start, found by a plain breadth first search
+    '''
+    distances = {start: 0}
+    states = [start]
+    for state in states:
+        for new_state in klotski.findNextStates(state):
+            if new_state not in distances:
+                distances[new_state] = distances[state] + 1
+                states.append(new_state)
+    return distances
+
+def applyMoves(state, moves):
+    ''' applyMoves
+    Makes each of moves on an encoded board in turn, failing the test if
+    any of them isn't a legal move
+    '''
+    for move in moves:
+        for key in klotski.findNextStates(state):
+            if klotski.findMove(state, key) == list(move):
+                state = key
+                break
+        else:
+            pytest.fail('{} is not a legal move'.format(move))
+    return state
+
+def firstSolution(board, mirror=False):
+    for moves, length in klotski.findSolutions(
+            klotski.makeDictionary(board, mirror), limit=1):
+        return moves
+    return None
+
+@pytest.fixture(scope='module')
+def distances():
+    return klotski.makeDistanceTable()
+
+@pytest.fixture(scope='module')
+def samples(distances):
+    ''' A few solvable boards at a spread of distances from solved '''
+    by_distance = {}
+    for state, distance in distances.items():
+        by_distance.setdefault(distance, []).append(state)
+    rng = random.Random(0)
+    return [rng.choice(by_distance[distance])
+            for distance in [1, 12, 37, 70, 126]]
+
+@pytest.fixture(scope='module')
+def unsolvable(distances):
+    ''' A board with the standard pieces which can't be solved '''
+    counts = klotski.countPieces(klotski.encode(klotski.klotski_board))
+    for rank in range(klotski.countLayouts(0, counts)):
+        state = klotski.unrankState(rank, counts)
+        if state not in distances:
+            return state
+
+@pytest.fixture(scope='module')
+def database(distances, tmp_path_factory):
+    path = str(tmp_path_factory.mktemp('db') / 'klotski.db')
+    klotski_db.writeDatabase(path, distances)
+    database = klotski_db.openDatabase(path)
+    yield database
+    klotski_db.closeDatabase(database)
+
+
+def test_next_states_match_legacy():
+    ''' findNextStates() and shiftNextStates() find exactly the boards
+    findValidMoves() and moveBoard() do, from every reachable board (the
+    original functions only know the standard pieces) '''
+    states = reachableStates(klotski.encode(klotski.klotski_board))
+    for state in states:
+        board = klotski.decode(state)
+        legacy = set()
+        for move in klotski.findValidMoves(board):
+            new_board = klotski.moveBoard([row[:] for row in board], move)
+            legacy.add(klotski.encode(new_board))
+        for find in [klotski.findNextStates, klotski.shiftNextStates]:
+            new_states = find(state)
+            assert len(new_states) == len(set(new_states)), (
+                '{} repeats boards from\n{}'.format(
+                    find.__name__, klotski.board2String(board)))
+            assert set(new_states) == legacy, (
+                '{} differs from findValidMoves from\n{}'.format(
+                    find.__name__, klotski.board2String(board)))
+
+def test_rank_round_trip(samples, unsolvable):
+    counts = klotski.countPieces(samples[0])
+    for state in samples + [unsolvable]:
+        rank = klotski.rankState(state)
+        assert 0 <= rank < klotski.countLayouts(0, counts)
+        assert klotski.unrankState(rank, counts) == state
+
+def test_layer_sizes_match_search():
+    distances = findDistances(klotski.encode(klotski.klotski_board))
+    sizes = klotski.findLayerSizes(klotski.klotski_board)
+    assert sizes == [list(distances.values()).count(layer)
+                     for layer in range(len(sizes))]
+    assert sum(sizes) == len(distances)
+
+engines = {
+    'bfs': firstSolution,
+    'bidirectional': lambda board: klotski.solveBidirectional(board)[0],
+    'astar': lambda board: klotski.solveAStar(board)[0],
+    'astar manhattan': lambda board: klotski.solveAStar(
+        board, klotski.manhattanHeuristic)[0],
+    'batch': lambda board: klotski.solveBatch([board])[0],
+    'frontier': lambda board: klotski.solveFrontier(board)[0],
+}
+
+@pytest.mark.parametrize('engine', sorted(engines))
+def test_engines_match_table(engine, distances, samples):
+    for state in samples:
+        moves = engines[engine](klotski.decode(state))
+        assert len(moves) == distances[state]
+        assert applyMoves(state, moves) & klotski.solved_bit
+
+def test_idastar_matches_table(distances, samples):
+    for state in samples[:3]:
+        moves = klotski.solveIDAStar(klotski.decode(state))[0]
+        assert len(moves) == distances[state]
+        assert applyMoves(state, moves) & klotski.solved_bit
+
+def test_idastar_hashed(samples):
+    board = klotski.decode(samples[2])
+    assert (klotski.solveIDAStar(board, hashed=True) ==
+            klotski.solveIDAStar(board))
+
+def test_zobrist_move_matches_board():
+    for state in reachableStates(klotski.encode(klotski.klotski_board)):
+        board = klotski.decode(state)
+        key = klotski.zobristBoard(board)
+        for new_state in klotski.findNextStates(state):
+            move = klotski.findMove(state, new_state)
+            assert (klotski.zobristMove(key, board, move) ==
+                    klotski.zobristHash(new_state))
+
+@pytest.mark.parametrize('size', [1, 5, 50])
+def test_bidirectional_few_goals(size):
+    ''' With fewer goals than the boards in the forward layers, the
+    backward search is expanded too '''
+    start = klotski.encode(klotski.klotski_board)
+    reachable = findDistances(start)
+    rng = random.Random(size)
+    goals = rng.sample(sorted(reachable.keys() - {start}), size)
+    moves, expanded = klotski.solveBidirectional(klotski.klotski_board,
+                                                 goals)
+    assert len(moves) == min(reachable[goal] for goal in goals)
+    assert applyMoves(start, moves) in goals
+
+def test_table_matches_table(distances, samples):
+    for state in samples:
+        moves = klotski.solveFromTable(distances, klotski.decode(state))
+        assert len(moves) == distances[state]
+        assert applyMoves(state, moves) & klotski.solved_bit
+
+def test_database_matches_table(distances, samples, database):
+    for state in samples:
+        moves = klotski_db.solveFromDatabase(database, klotski.decode(state))
+        assert len(moves) == distances[state]
+        assert applyMoves(state, moves) & klotski.solved_bit
+
+def test_database_letter_boards(distances, database):
+    ''' Boards read from boards.txt have bare piece letters '''
+    board = klotski.readBoards(os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), 'boards.txt'))[0]
+    moves = klotski_db.solveFromDatabase(database, board)
+    assert len(moves) == distances[klotski.encode(board)]
+
+def test_slides_shorter_than_moves(distances, samples):
+    for state in samples:
+        slides = klotski.solveSlides(klotski.decode(state))[0]
+        moves = [move for slide in slides for move in slide]
+        assert len(slides) <= distances[state] <= len(moves)
+        assert applyMoves(state, moves) & klotski.solved_bit
+
+def test_parallel_matches_solve():
+    moves, expanded = klotski_parallel.solveParallel(klotski.klotski_board, 2)
+    assert len(moves) == 116
+    assert (applyMoves(klotski.encode(klotski.klotski_board), moves) &
+            klotski.solved_bit)
+
+def test_external_matches_solve():
+    sizes = []
+    board_dictionary = klotski.makeDictionary(klotski.klotski_board)
+    while klotski.layerStats(board_dictionary)['boards']:
+        sizes.append(klotski.layerStats(board_dictionary)['boards'])
+        klotski.expandLayer(board_dictionary)
+    external_sizes, solutions = klotski_external.solveExternal(
+        klotski.klotski_board, chunk_size=5000)
+    assert external_sizes == sizes
+    assert len(solutions[0]) == 116
+    assert (applyMoves(klotski.encode(klotski.klotski_board), solutions[0]) &
+            klotski.solved_bit)
+
+def test_shared_layers_match_search():
+    sizes, distances = klotski_parallel.findLayersShared(
+        klotski.klotski_board, 2)
+    assert sizes == klotski.findLayerSizes(klotski.klotski_board)
+    assert len(distances) - distances.count(255) == 25955
+
+def test_numpy_layers_match_search():
+    klotski_numpy = pytest.importorskip('klotski_numpy')
+    start = klotski.encode(klotski.klotski_board)
+    distances = findDistances(start)
+    layers = klotski_numpy.findLayers(klotski.klotski_board)
+    for layer in range(len(layers)):
+        states = klotski_numpy.unpackStates(layers[layer])
+        assert sorted(states) == sorted(
+            state for state in distances if distances[state] == layer)
+    assert sum(len(layer) for layer in layers) == len(distances)
+
+def test_pack_states_needs_one_r():
+    klotski_numpy = pytest.importorskip('klotski_numpy')
+    state = klotski.encode([list(row) for row in
+                            'BWWB BWWB BPPB BWWB WXXW'.split()])
+    with pytest.raises(ValueError):
+        klotski_numpy.packStates([state])
+
+def test_mirror():
+    ''' A board and its reflection share a key, and the search treating
+    them as the same still finds real moves from the start '''
+    start = klotski.encode(klotski.klotski_board)
+    states = reachableStates(start)
+    for state in states:
+        assert klotski.mirrorState(klotski.mirrorState(state)) == state
+    assert len({klotski.mirrorKey(state) for state in states}) == 13011
+    moves = firstSolution(klotski.klotski_board, mirror=True)
+    assert len(moves) == 116
+    assert applyMoves(start, moves) & klotski.solved_bit
+
+def test_forward_solve():
+    moves, expanded = klotski.forwardSolve(klotski.klotski_board)
+    assert len(moves) == 116
+    assert (applyMoves(klotski.encode(klotski.klotski_board), moves) &
+            klotski.solved_bit)
+
+def test_solved_start(distances):
+    state = klotski.findGoalStates(
+        klotski.encode(klotski.klotski_board))[0]
+    board = klotski.decode(state)
+    for engine in sorted(engines):
+        assert engines[engine](board) == [], engine
+    assert klotski.solveIDAStar(board) == ([], 0)
+    assert klotski.solveSlides(board)[0] == []
+    assert klotski.solveFromTable(distances, board) == []
+    assert list(klotski.findSolutions(klotski.makeDictionary(board))) == [
+        ([], 0)]
+    assert klotski.forwardSolve(board) == ([], 0)
+
+def test_start_in_goals():
+    start = klotski.encode(klotski.klotski_board)
+    assert klotski.solveBidirectional(klotski.klotski_board, [start]) == (
+        [], 0)
+
+def test_unsolvable(distances, unsolvable, database):
+    board = klotski.decode(unsolvable)
+    for engine in sorted(engines):
+        assert engines[engine](board) is None, engine
+    assert klotski.solveSlides(board)[0] is None
+    assert klotski.solveFromTable(distances, board) is None
+    assert klotski_db.solveFromDatabase(database, board) is None
+
+def test_find_solutions_limit():
+    board_dictionary = klotski.makeDictionary(klotski.klotski_board)
+    assert list(klotski.findSolutions(board_dictionary, limit=0)) == []
+    lengths = [length for moves, length in klotski.findSolutions(
+        klotski.makeDictionary(klotski.klotski_board), optimal=True)]
+    assert lengths == [116, 116]
+
+def test_measure_layers():
+    records = []
+    returned = klotski.measureLayers(
+        klotski.makeDictionary(klotski.klotski_board), records.append)
+    assert returned == records
+    assert len(records) == 137
+    for record in records:
+        assert set(record) == {'layer', 'frontier', 'new', 'duplicates',
+                               'solutions', 'branching', 'seconds',
+                               'checked', 'peak_rss', 'peak_traced'}
+        assert (record['frontier'] * record['branching'] == pytest.approx(
+            record['new'] + record['duplicates'] + record['solutions']))
+    assert [record['layer'] for record in records] == list(range(1, 138))
+    assert sum(record['solutions'] for record in records) == 8